@@ -0,0 +1,85 @@
+"""ATS board feed polling against recorded fixtures served locally.
+
+Run with ``python -m benchmarks.ats_board_bench [COPIES]`` (default 50).
+Serves the feeds in ``benchmarks/fixtures/ats_boards`` (each board
+``COPIES`` times under different tokens) and polls them three times with
+``run_ats_board_scan``: a cold poll, a re-poll answered with 304s, and a
+re-poll from a server without validators (caught by the body hash). A
+fourth poll runs another profile's keywords against the unchanged feeds.
+Correctness of these paths is covered by ``tests/test_ats_boards.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.fake_providers import FakeProviderServer
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "ats_boards"
+BASE_QUERIES = Path(__file__).resolve().parent.parent / "config" / "base_queries.json"
+
+
+def main() -> None:
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    server = FakeProviderServer(fixtures_dir=FIXTURES).start()
+
+    with tempfile.TemporaryDirectory(prefix="ats-board-bench-") as tmp:
+        domains = {
+            "greenhouse.io": "boards.greenhouse.io",
+            "lever.co": "jobs.lever.co",
+            "workable.com": "apply.workable.com",
+            "smartrecruiters.com": "jobs.smartrecruiters.com",
+        }
+        boards = {
+            domains[root.name]: [f"{fixture.stem}-{i}" for fixture in root.glob("*.json") for i in range(copies)]
+            for root in FIXTURES.iterdir()
+            if root.is_dir()
+        }
+        (Path(tmp) / "ats_boards.json").write_text(json.dumps(boards), encoding="utf-8")
+        queries = json.loads(BASE_QUERIES.read_text(encoding="utf-8"))
+        queries["accounting"] = {"title_keywords": ['"Accountant"']}
+        (Path(tmp) / "base_queries.json").write_text(json.dumps(queries), encoding="utf-8")
+        os.environ.update(
+            DATABASE_URL=f"sqlite:///{tmp}/bench.sqlite3",
+            ATS_BOARDS_CONFIG=f"{tmp}/ats_boards.json",
+            BASE_QUERY_CONFIG=f"{tmp}/base_queries.json",
+            ATS_BOARD_DISCOVERY="0",
+            ATS_BOARDS_RATE_PER_SECOND="10000",
+        )
+
+        from geo_job_sentinel.search import ats_boards
+        from geo_job_sentinel.search.pipeline import run_ats_board_scan
+
+        for root, (_, parser) in list(ats_boards.BOARD_FEEDS.items()):
+            ats_boards.BOARD_FEEDS[root] = (f"{server.url}/boards/{root}/{{token}}", parser)
+
+        passes = (
+            # label, profile, server sends validators
+            ("cold", "gis_default", True),
+            ("304 re-poll", "gis_default", True),
+            ("no validators", "gis_default", False),
+            ("other keywords, unchanged", "accounting", True),
+        )
+        for label, profile, validators in passes:
+            server.reset(validators=validators)
+            started = time.perf_counter()
+            jobs, stats = run_ats_board_scan(profile=profile)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{label}: {stats['boards']['polled']} boards in {elapsed:.2f}s, "
+                f"{len(jobs)} {profile} jobs from {stats['total_scanned']} postings, "
+                f"{stats['boards']['unchanged']} unchanged ({server.not_modified} 304s), "
+                f"{stats['boards']['failed']} failed, {server.calls['boards']} requests"
+            )
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
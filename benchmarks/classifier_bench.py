@@ -0,0 +1,102 @@
+"""Microbenchmark: ClassifierEngine vs the original any()-based checks.
+
+Run with ``python -m benchmarks.classifier_bench [N]`` (default 20000 jobs).
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from typing import List
+
+from geo_job_sentinel.classifier import ClassifierEngine
+from geo_job_sentinel.models import JobPosting, LocationType
+
+
+WORDS = (
+    "gis analyst geospatial developer remote sensing county city government spatial data "
+    "python arcgis qgis team hybrid onsite flexible engineer mapping imagery lidar we are hiring"
+).split()
+
+
+def _legacy_classify(job: JobPosting):
+    # Copy of the pre-engine implementation, kept here as the baseline.
+    text = " ".join([job.title or "", job.description_snippet or "", job.location or ""]).lower()
+    remote = ["remote", "work from home", "wfh", "anywhere", "distributed"]
+    hybrid = ["hybrid", "flexible", "part-remote", "part time remote"]
+    onsite = ["onsite", "on-site", "on site", "office-based"]
+    if any(m in text for m in remote):
+        location_type = LocationType.HYBRID if any(m in text for m in hybrid) else LocationType.REMOTE
+    elif any(m in text for m in hybrid):
+        location_type = LocationType.HYBRID
+    elif any(m in text for m in onsite):
+        location_type = LocationType.ONSITE
+    elif "," in job.location and "remote" not in job.location.lower():
+        location_type = LocationType.ONSITE
+    else:
+        location_type = LocationType.UNKNOWN
+
+    cat_text = " ".join([job.title.lower(), job.company.lower(), job.description_snippet.lower()])
+    url = job.url.lower()
+    if any(m in cat_text for m in [" county", " city", " government", ".gov"]) or any(
+        m in url for m in [".gov", "county"]
+    ):
+        category = "Government"
+    else:
+        category = "General GIS"
+
+    date_text = str((job.raw_source or {}).get("date", "")).lower()
+    if any(k in date_text for k in ["hour", "minute", "today"]):
+        freshness = "fresh"
+    elif any(k in date_text for k in ["day", "yesterday"]):
+        freshness = "standard"
+    else:
+        freshness = "older" if date_text else "standard"
+    return location_type, category, freshness
+
+
+def make_jobs(n: int, seed: int = 7) -> List[JobPosting]:
+    rng = random.Random(seed)
+    dates = ["2 hours ago", "3 days ago", "Jan 4, 2024", "", "yesterday"]
+    return [
+        JobPosting(
+            id=str(i),
+            title=" ".join(rng.choices(WORDS, k=4)),
+            company=" ".join(rng.choices(WORDS, k=2)),
+            location=rng.choice(["Denver, CO", "Remote", "Unknown"]),
+            source="bench",
+            url=f"https://example{i % 50}.com/jobs/{i}",
+            description_snippet=" ".join(rng.choices(WORDS, k=40)),
+            raw_source={"date": rng.choice(dates)},
+        )
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    jobs = make_jobs(n)
+    engine = ClassifierEngine()
+
+    started = time.perf_counter()
+    legacy = [_legacy_classify(job) for job in jobs]
+    legacy_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled = engine.classify_batch(jobs)
+    compiled_s = time.perf_counter() - started
+
+    mismatches = sum(
+        1
+        for old, new in zip(legacy, compiled)
+        if old != (new.location_type, new.category, new.freshness)
+    )
+    print(f"jobs: {n}")
+    print(f"legacy any():   {legacy_s * 1e6 / n:7.2f} us/job")
+    print(f"ClassifierEngine: {compiled_s * 1e6 / n:7.2f} us/job ({legacy_s / compiled_s:.2f}x)")
+    print(f"mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Local stand-in for the Serper, Twitter and Discord webhook APIs.
+
+Used by the scan benchmarks so that a full scan can run end to end without
+touching the network. Start it with ``FakeProviderServer(...).start()`` and
+point the clients at ``server.url``:
+
+- ``POST /serper``   Serper search; ``q``/``num``/``page`` paginate a
+  deterministic result list of ``results_per_query`` items per query
+  (``results_by_query`` overrides it for single queries); ``served`` counts
+  the items each query was paged up to.
+- ``GET /twitter``   Twitter recent search; pages of ``max_results`` tweets
+  linked by ``meta.next_token``, ``tweets_per_query`` in total.
+- ``POST /discord``  Discord webhook; answers like ``?wait=true`` and sends
+  ``X-RateLimit-*`` headers.
+- ``GET /boards/<root>/<token>``  ATS board feed recorded in
+  ``fixtures_dir/<root>/<token>.json`` (a ``-N`` suffix on the token serves
+  the same fixture). Sends ETag/Last-Modified and answers matching
+  conditional requests with 304, unless ``validators`` is off.
+
+Every endpoint sleeps ``latency`` seconds per request and answers every
+``rate_limit_every``-th request with a 429 carrying ``Retry-After``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+WORDS = (
+    "gis analyst geospatial developer remote sensing county city government spatial data "
+    "python arcgis qgis team hybrid onsite flexible engineer mapping imagery lidar postgis "
+    "raster vector cartography survey utilities transportation environmental planning "
+    "database cloud pipeline field collection modelling hydrology forestry agriculture"
+).split()
+
+_SITE_RE = re.compile(r"site:([\w.-]+)")
+
+
+def _query_id(query: str) -> str:
+    return hashlib.sha1(query.encode("utf-8")).hexdigest()[:8]
+
+
+def _text(seed: str, words: int) -> str:
+    # Distinct word salad per item so near-duplicate detection keeps them apart.
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+class FakeProviderServer:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        results_per_query: int = 10,
+        results_by_query: Optional[Dict[str, int]] = None,
+        tweets_per_query: int = 0,
+        rate_limit_every: int = 0,
+        retry_after: float = 0.05,
+        fixtures_dir: Optional[Path] = None,
+        validators: bool = True,
+    ) -> None:
+        self.latency = latency
+        self.results_per_query = results_per_query
+        self.results_by_query = results_by_query or {}
+        self.tweets_per_query = tweets_per_query
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir is not None else None
+        self.validators = validators
+        self._started_at = formatdate(time.time(), usegmt=True)
+        self.calls: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self.queries: set = set()
+        self.served: Counter = Counter()
+        self.not_modified = 0
+        self._requests = 0
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        assert self._httpd is not None, "server not started"
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeProviderServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this the
+            # body waits on delayed ACKs and every call looks ~40ms slower.
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                server._dispatch(self)
+
+            def do_POST(self) -> None:
+                server._dispatch(self)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, name="fake-providers", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def reset(self, **settings) -> None:
+        """Clear counters and optionally change settings between runs."""
+
+        with self._lock:
+            for name, value in settings.items():
+                setattr(self, name, value)
+            self.calls.clear()
+            self.rate_limited.clear()
+            self.queries.clear()
+            self.served.clear()
+            self.not_modified = 0
+            self._requests = 0
+
+    # -- request handling -------------------------------------------------
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler) -> None:
+        parts = urlsplit(handler.path)
+        endpoint, _, rest = parts.path.strip("/").partition("/")
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length) or b"{}") if length else {}
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self._requests += 1
+            self.calls[endpoint] += 1
+            throttled = bool(self.rate_limit_every) and self._requests % self.rate_limit_every == 0
+            if throttled:
+                self.rate_limited[endpoint] += 1
+
+        if throttled:
+            self._send(
+                handler,
+                429,
+                {"message": "You are being rate limited.", "retry_after": self.retry_after},
+                {"Retry-After": str(self.retry_after)},
+            )
+        elif endpoint == "serper":
+            self._send(handler, 200, self._serper(body))
+        elif endpoint == "twitter":
+            self._send(handler, 200, self._twitter(parse_qs(parts.query)))
+        elif endpoint == "boards":
+            self._board(handler, rest)
+        elif endpoint == "discord":
+            self._send(
+                handler,
+                200,
+                {"id": str(self._requests), "embeds": body.get("embeds", [])},
+                {"X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "0"},
+            )
+        else:
+            self._send(handler, 404, {"message": "unknown endpoint"})
+
+    def _send(self, handler, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _board(self, handler: BaseHTTPRequestHandler, rest: str) -> None:
+        root, _, token = rest.partition("/")
+        name = re.sub(r"-\d+$", "", token)
+        path = self.fixtures_dir / root / f"{name}.json" if self.fixtures_dir else None
+        if path is None or not path.is_file():
+            self._send(handler, 404, {"error": "board not found"})
+            return
+
+        data = path.read_bytes()
+        etag = '"' + hashlib.sha1(data).hexdigest()[:16] + '"'
+        if self.validators and handler.headers.get("If-None-Match") == etag:
+            with self._lock:
+                self.not_modified += 1
+            handler.send_response(304)
+            handler.send_header("ETag", etag)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        if self.validators:
+            handler.send_header("ETag", etag)
+            handler.send_header("Last-Modified", self._started_at)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _serper(self, body: dict) -> dict:
+        query = body.get("q", "")
+        num = int(body.get("num", 10))
+        start = (int(body.get("page", 1)) - 1) * num
+        stop = min(start + num, self.results_by_query.get(query, self.results_per_query))
+        with self._lock:
+            self.queries.add(("serper", query))
+            self.served[query] = max(self.served[query], stop)
+        qid = _query_id(query)
+        sites: List[str] = _SITE_RE.findall(query) or ["careers.example.com"]
+
+        organic = []
+        for i in range(start, stop):
+            site = sites[i % len(sites)]
+            organic.append(
+                {
+                    "title": f"GIS Analyst - {_text(qid + 't' + str(i), 3).title()}",
+                    "link": f"https://{site}/bench{qid}/jobs/{i}",
+                    "snippet": _text(qid + str(i), 24),
+                    "date": f"{i % 24} hours ago",
+                    "position": i - start + 1,
+                }
+            )
+        return {"organic": organic}
+
+    def _twitter(self, params: dict) -> dict:
+        query = params.get("query", [""])[0]
+        with self._lock:
+            self.queries.add(("twitter", query))
+        per_page = int(params.get("max_results", ["10"])[0])
+        start = int(params.get("next_token", ["0"])[0])
+        stop = min(start + per_page, self.tweets_per_query)
+        qid = _query_id(query)
+
+        tweets, users = [], {}
+        for i in range(start, stop):
+            author_id = f"u{i % 50}"
+            users[author_id] = {"id": author_id, "name": f"Geo Employer {i % 50}", "username": f"geo{i % 50}"}
+            tweets.append(
+                {
+                    "id": str(10**15 + i),
+                    "author_id": author_id,
+                    "text": f"We're hiring a GIS analyst\n{_text(qid + 'tw' + str(i), 20)}",
+                    "entities": {"urls": [{"expanded_url": f"https://careers.example.org/{qid}/{i}"}]},
+                }
+            )
+
+        payload: dict = {"data": tweets, "includes": {"users": list(users.values())}, "meta": {}}
+        if stop < self.tweets_per_query:
+            payload["meta"]["next_token"] = str(stop)
+        return payload
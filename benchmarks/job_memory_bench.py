@@ -0,0 +1,91 @@
+"""Memory comparison: original JobPosting dataclass vs the slotted one.
+
+Run with ``python -m benchmarks.job_memory_bench [N]`` (default 100000 jobs).
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from geo_job_sentinel.models import JobPosting, LocationType
+
+
+@dataclass
+class LegacyJobPosting:
+    # Copy of the pre-slots definition, kept here as the baseline.
+    id: str
+    title: str
+    company: str
+    location: str
+    source: str
+    url: str
+    description_snippet: str
+    category: str = "General GIS"
+    is_new_company: bool = False
+    location_type: LocationType = LocationType.UNKNOWN
+    discovered_at: datetime = field(default_factory=datetime.utcnow)
+    raw_source: Optional[dict] = None
+
+
+def _serper_item(i: int) -> dict:
+    # Shaped like a Serper organic result; strings built per item as a parser would.
+    return {
+        "title": f"GIS Analyst {i} - Example Geo {i % 300}",
+        "link": f"https://boards.greenhouse.io/examplegeo{i % 300}/jobs/{4000000 + i}",
+        "snippet": (
+            f"Example Geo {i % 300} is hiring a GIS Analyst to maintain spatial data, build "
+            "ArcGIS Pro and QGIS workflows and support field teams. Hybrid in Denver, CO."
+        ),
+        "date": f"{i % 24} hours ago",
+        "position": i % 10 + 1,
+        "sitelinks": [{"title": "Careers", "link": f"https://examplegeo{i % 300}.com/careers"}],
+        "source": "".join(["Example Geo ", str(i % 300)]),
+    }
+
+
+def _build(cls: Callable, n: int) -> List:
+    jobs = []
+    for i in range(n):
+        item = _serper_item(i)
+        jobs.append(
+            cls(
+                id=item["link"],
+                title=item["title"],
+                company=item["source"],
+                location="Denver, CO",
+                source="".join(["Serper/", "Google"]),
+                url=item["link"],
+                description_snippet=item["snippet"],
+                raw_source=item,
+            )
+        )
+    return jobs
+
+
+def _measure(cls: Callable, n: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    jobs = _build(cls, n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del jobs
+    return current
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    legacy = _measure(LegacyJobPosting, n)
+    slotted = _measure(JobPosting, n)
+    print(f"jobs: {n}")
+    print(f"legacy dataclass:  {legacy / 2**20:8.1f} MiB ({legacy / n:6.0f} B/job)")
+    print(f"slotted JobPosting: {slotted / 2**20:8.1f} MiB ({slotted / n:6.0f} B/job)")
+    print(f"saving: {(1 - slotted / legacy) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
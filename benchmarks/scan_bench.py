@@ -0,0 +1,190 @@
+"""End-to-end scan + delivery benchmark against local fake providers.
+
+Run with ``python -m benchmarks.scan_bench`` (sizes 10, 1000 and 100000 by
+default). Each size runs ``run_full_scan`` followed by Discord delivery in a
+fresh subprocess with an empty database, so peak RSS is per run. Serper,
+Twitter and the webhook are served by ``benchmarks.fake_providers``.
+
+Options::
+
+    --sizes 10,1000        jobs found per run (results served, spread over the scan's queries)
+    --latency-ms 20        per-request server latency
+    --rate-limit-every 50  answer every 50th request with a 429
+    --twitter-share 0.1    fraction of results served as tweets
+    --stream               use stream_full_scan + deliver_batches instead
+    --json                 print one JSON object per run
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks.fake_providers import FakeProviderServer
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(pct / 100 * len(ordered))) - 1)]
+
+
+def _spread(total: int, caps: Dict[str, float]) -> Dict[str, int]:
+    """Split ``total`` results as evenly as ``caps`` (max results per query) allow."""
+
+    counts: Dict[str, int] = {}
+    remaining = total
+    ordered = sorted(caps, key=lambda query: (caps[query], query))
+    for i, query in enumerate(ordered):
+        counts[query] = int(min(caps[query], math.ceil(remaining / (len(ordered) - i))))
+        remaining -= counts[query]
+    return counts
+
+
+def _child(base_url: str, stream: bool) -> None:
+    # Runs inside the subprocess; config comes from the environment.
+    from geo_job_sentinel import transport
+    from geo_job_sentinel.discord_integration.delivery import deliver_batches, deliver_jobs
+    from geo_job_sentinel.search.pipeline import run_full_scan, stream_full_scan
+    from geo_job_sentinel.search.serper_client import SerperClient
+    from geo_job_sentinel.search.twitter_client import TwitterClient
+
+    SerperClient.BASE_URL = f"{base_url}/serper"
+    TwitterClient.BASE_URL = f"{base_url}/twitter"
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+
+    def record(resp, *args, **kwargs):
+        latencies[resp.url.split("?")[0].rsplit("/", 1)[-1]].append(resp.elapsed.total_seconds())
+
+    transport.get_session().hooks["response"].append(record)
+
+    started = time.perf_counter()
+    stats: dict = {}
+    if stream:
+        report = deliver_batches(stream_full_scan(stats))
+        scan_done = delivered = time.perf_counter()
+        jobs = stats.get("new_jobs", 0)
+    else:
+        found, stats = run_full_scan()
+        scan_done = time.perf_counter()
+        report = deliver_jobs(found)
+        delivered = time.perf_counter()
+        jobs = len(found)
+
+    print(
+        json.dumps(
+            {
+                "jobs": jobs,
+                "scanned": stats.get("total_scanned", 0),
+                "sent": report.sent,
+                "messages": report.messages,
+                "scan_seconds": scan_done - started,
+                "total_seconds": delivered - started,
+                "latency": {
+                    name: {"p50": _percentile(values, 50), "p99": _percentile(values, 99)}
+                    for name, values in latencies.items()
+                },
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            }
+        )
+    )
+
+
+def _run(server: FakeProviderServer, stream: bool, max_pages: int = 0) -> dict:
+    most = max(server.results_by_query.values(), default=0)
+    with tempfile.TemporaryDirectory(prefix="scan-bench-") as tmp:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{tmp}/bench.sqlite3",
+            SERPER_API_KEY="bench",
+            TWITTER_BEARER_TOKEN="bench",
+            DISCORD_WEBHOOK_URL=f"{server.url}/discord",
+            SEARCH_CACHE_TTL_SECONDS="0",
+            INCREMENTAL_SCANS="0",
+            SERPER_MAX_PAGES=str(max_pages or math.ceil(most / 10) + 1),
+            SERPER_RATE_PER_SECOND="10000",
+            TWITTER_RATE_PER_SECOND="10000",
+            TWITTER_MAX_RESULTS=str(server.tweets_per_query),
+            SCAN_SOURCE_TIMEOUT_SECONDS="3600",
+            HTTP_MAX_RETRY_WAIT_SECONDS="5",
+        )
+        cmd = [sys.executable, "-m", "benchmarks.scan_bench", "--child", server.url]
+        if stream:
+            cmd.append("--stream")
+        out = subprocess.run(cmd, env=env, check=True, capture_output=True, text=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["api_calls"] = dict(server.calls)
+    result["rate_limited"] = dict(server.rate_limited)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,1000,100000")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--twitter-share", type=float, default=0.1)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.stream)
+        return
+
+    server = FakeProviderServer(
+        latency=args.latency_ms / 1000, rate_limit_every=args.rate_limit_every
+    ).start()
+    try:
+        # Calibration runs with unlimited results list the Serper queries a
+        # scan issues. Most page further with a higher SERPER_MAX_PAGES; the
+        # others (seed batches, 5 results per domain) have a fixed cap. Each
+        # size is then spread over the queries so the scan finds exactly it.
+        server.reset(results_per_query=10**9, results_by_query={}, tweets_per_query=0, rate_limit_every=0)
+        _run(server, args.stream, max_pages=1)
+        one_page = dict(server.served)
+        server.reset()
+        _run(server, args.stream, max_pages=2)
+        caps = {query: n if n == one_page.get(query) else math.inf for query, n in server.served.items()}
+
+        for size in (int(s) for s in args.sizes.split(",")):
+            tweets = int(size * args.twitter_share)
+            server.reset(
+                results_per_query=0,
+                results_by_query=_spread(size - tweets, caps),
+                tweets_per_query=tweets,
+                rate_limit_every=args.rate_limit_every,
+            )
+            result = _run(server, args.stream)
+            result["size"] = size
+
+            if args.json:
+                print(json.dumps(result))
+                continue
+            print(f"size {size}: {result['jobs']} jobs, {result['sent']} sent in {result['messages']} messages")
+            print(
+                f"  scan {result['scan_seconds']:.2f}s, total {result['total_seconds']:.2f}s, "
+                f"{result['jobs'] / max(result['total_seconds'], 1e-9):.0f} jobs/s, "
+                f"peak RSS {result['peak_rss_mb']:.1f} MB"
+            )
+            print(f"  API calls {result['api_calls']}, 429s {result['rate_limited']}")
+            for name, lat in sorted(result["latency"].items()):
+                print(f"  {name} latency p50 {lat['p50'] * 1000:.1f}ms p99 {lat['p99'] * 1000:.1f}ms")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .storage.yield_stats import YieldStore
+
+
+# YieldStore scope of whole sources, keyed by ``profile_source_names``.
+SOURCE_SCOPE = "source"
+
+
+def adaptive_enabled() -> bool:
+    """ADAPTIVE_SCHEDULING=1 replaces the per-profile crons with ``plan_run`` ticks."""
+
+    return os.getenv("ADAPTIVE_SCHEDULING", "0") not in ("0", "false", "no", "")
+
+
+def _hours(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default))) * 3600
+
+
+def plan_run(store: YieldStore, names: Iterable[str], now: Optional[float] = None) -> List[str]:
+    """Pick the sources to run now.
+
+    A source is due once its adaptive interval has passed (sources that
+    never ran are due at once). Due sources are taken best first, by
+    smoothed new jobs per API call with unmeasured sources ahead of all
+    others, as long as their usual number of metered calls (Serper and
+    Twitter requests; ADAPTIVE_DEFAULT_CALLS, default 10, before the first
+    run) fits in what is left of DAILY_API_BUDGET (default 500) today.
+    """
+
+    now = time.time() if now is None else now
+    remaining = int(os.getenv("DAILY_API_BUDGET", "500")) - store.spent_today()
+    default_calls = float(os.getenv("ADAPTIVE_DEFAULT_CALLS", "10"))
+
+    due = [name for name in names if store.next_due(SOURCE_SCOPE, name) <= now]
+    rates: Dict[str, float] = {}
+    for name in due:
+        rate = store.yield_rate(SOURCE_SCOPE, name)
+        rates[name] = math.inf if rate is None else rate
+    due.sort(key=lambda name: rates[name], reverse=True)
+
+    chosen = []
+    for name in due:
+        calls = store.calls_per_run(SOURCE_SCOPE, name)
+        calls = default_calls if calls is None else calls
+        if calls > remaining:
+            continue
+        chosen.append(name)
+        remaining -= calls
+    return chosen
+
+
+def record_run(store: YieldStore, per_source: Dict[str, dict]) -> Dict[str, float]:
+    """Record a run's ``stats["per_source"]`` and schedule each source's next run.
+
+    Intervals start at ADAPTIVE_INITIAL_INTERVAL_HOURS (default 24, the old
+    daily cadence), halve after a run with new jobs and double after an
+    empty or failed one, within ADAPTIVE_MIN_INTERVAL_HOURS (default 1) and
+    ADAPTIVE_MAX_INTERVAL_HOURS (default 168). Metered calls count against
+    today's budget. Returns the new interval per source, in seconds.
+    """
+
+    initial = _hours("ADAPTIVE_INITIAL_INTERVAL_HOURS", 24)
+    shortest = _hours("ADAPTIVE_MIN_INTERVAL_HOURS", 1)
+    longest = _hours("ADAPTIVE_MAX_INTERVAL_HOURS", 168)
+
+    intervals = {}
+    for name, entry in per_source.items():
+        api_calls = entry.get("api_calls", 0)
+        new_jobs = 0 if entry.get("failed") else entry.get("new_jobs", 0)
+        store.record_run(
+            SOURCE_SCOPE, name, api_calls=api_calls, results=entry.get("results", 0), new_jobs=new_jobs, label=name
+        )
+        intervals[name] = store.reschedule(SOURCE_SCOPE, name, api_calls, new_jobs, initial, shortest, longest)
+        store.spend(api_calls)
+    return intervals
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from .config_loader import AppConfig, load_config
+from .models import JobPosting, LocationType
+
+
+# Used when config/classifier_markers.json is missing or omits a section.
+DEFAULT_MARKERS: dict = {
+    "location_type": {
+        "remote": ["remote", "work from home", "wfh", "anywhere", "distributed"],
+        "hybrid": ["hybrid", "flexible", "part-remote", "part time remote"],
+        "onsite": ["onsite", "on-site", "on site", "office-based"],
+    },
+    "category": {
+        "Government": {
+            "text": [" county", " city", " government", ".gov"],
+            "url": [".gov", "county"],
+        },
+    },
+    "freshness": {
+        "fresh": ["hour", "minute", "today"],
+        "standard": ["day", "yesterday"],
+    },
+}
+
+DEFAULT_CATEGORY = "General GIS"
+
+
+def _compile(markers: Iterable[str]) -> Tuple[str, ...]:
+    # Lower-cased and de-duplicated, in a stable order.
+    return tuple(sorted({m.lower() for m in markers if m}, key=len))
+
+
+def _hit(markers: Tuple[str, ...], text: str) -> bool:
+    for marker in markers:
+        if marker in text:
+            return True
+    return False
+
+
+class Classification(NamedTuple):
+    location_type: LocationType
+    category: str
+    freshness: str  # "fresh", "standard" or "older"
+
+
+class ClassifierEngine:
+    """Location type, category and freshness classifier over precompiled markers.
+
+    Marker lists are loaded from config once and normalized into tuples;
+    ``classify`` lower-cases each field a single time and shares the text
+    between all three classifiers. CPython's substring search outruns an
+    ``re`` alternation on lists this short (see benchmarks/classifier_bench.py).
+    """
+
+    def __init__(self, markers: Optional[dict] = None) -> None:
+        markers = markers or {}
+        location = {**DEFAULT_MARKERS["location_type"], **markers.get("location_type", {})}
+        self._remote = _compile(location.get("remote", []))
+        self._hybrid = _compile(location.get("hybrid", []))
+        self._onsite = _compile(location.get("onsite", []))
+
+        categories = markers.get("category") or DEFAULT_MARKERS["category"]
+        self._categories = [
+            (name, _compile(rules.get("text", [])), _compile(rules.get("url", [])))
+            for name, rules in categories.items()
+        ]
+
+        freshness = {**DEFAULT_MARKERS["freshness"], **markers.get("freshness", {})}
+        self._fresh = _compile(freshness.get("fresh", []))
+        self._standard = _compile(freshness.get("standard", []))
+
+    def _location_type(self, text: str, location: str) -> LocationType:
+        # ``text`` is the lower-cased title + description + location.
+        if _hit(self._remote, text):
+            if _hit(self._hybrid, text):
+                return LocationType.HYBRID
+            return LocationType.REMOTE
+
+        if _hit(self._hybrid, text):
+            return LocationType.HYBRID
+
+        if _hit(self._onsite, text):
+            return LocationType.ONSITE
+
+        # Heuristic: if there is a clear city/state but no remote markers, assume onsite
+        if "," in location and "remote" not in location:
+            return LocationType.ONSITE
+
+        return LocationType.UNKNOWN
+
+    def _category(self, text: str, url: str) -> str:
+        for name, text_markers, url_markers in self._categories:
+            if _hit(text_markers, text) or _hit(url_markers, url):
+                return name
+        return DEFAULT_CATEGORY
+
+    def _freshness(self, date_text: str) -> str:
+        if _hit(self._fresh, date_text):
+            return "fresh"
+        if _hit(self._standard, date_text):
+            return "standard"
+        if date_text:
+            return "older"
+        return "standard"
+
+    def location_type(self, title: str, description: str, location: str) -> LocationType:
+        location = (location or "").lower()
+        text = f"{(title or '').lower()} {(description or '').lower()} {location}"
+        return self._location_type(text, location)
+
+    def classify(self, job: JobPosting) -> Classification:
+        title = job.title.lower()
+        snippet = job.description_snippet.lower()
+        location = job.location.lower()
+        date_text = str(job.raw_source.get("date", "")).lower() if job.raw_source else ""
+
+        return Classification(
+            self._location_type(f"{title} {snippet} {location}", location),
+            self._category(f"{title} {job.company.lower()} {snippet}", job.url.lower()),
+            self._freshness(date_text),
+        )
+
+    def classify_batch(self, jobs: Iterable[JobPosting]) -> List[Classification]:
+        classify = self.classify
+        return [classify(job) for job in jobs]
+
+
+_engine: Optional[Tuple[AppConfig, ClassifierEngine]] = None
+_engine_lock = threading.Lock()
+
+
+def get_classifier(cfg: Optional[AppConfig] = None) -> ClassifierEngine:
+    """Return the engine for the current config's markers, compiling it once.
+
+    ``load_config`` returns the same object until the config changes, so the
+    engine is rebuilt only after a config reload.
+    """
+
+    global _engine
+    cfg = cfg or load_config()
+    with _engine_lock:
+        if _engine is None or _engine[0] is not cfg:
+            _engine = (cfg, ClassifierEngine(cfg.classifier_markers))
+        return _engine[1]
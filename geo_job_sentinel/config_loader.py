@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -24,26 +25,137 @@ class AppConfig:
     base_queries: dict
     company_seeds: List[str]
     twitter_bearer_token: str | None
+    classifier_markers: dict
+    ats_boards: dict
 
 
-def load_config() -> AppConfig:
-    load_dotenv(BASE_DIR / ".env")
+DEFAULT_PROFILE = "gis_default"
+SCAN_SOURCES = ("ats", "boards", "discovery", "seeds", "twitter")
+
+
+@dataclass(frozen=True)
+class ScanProfile:
+    """A named query profile from base_queries.json.
+
+    Besides its keywords a profile may set ``schedule`` (crontab, UTC),
+    ``sources`` (subset of ``SCAN_SOURCES``) and ``discord_webhook_env``,
+    the environment variable holding the webhook of its Discord channel.
+    """
 
-    ats_path = os.getenv("ATS_DOMAINS_CONFIG", "config/ats_domains.json")
-    base_queries_path = os.getenv("BASE_QUERY_CONFIG", "config/base_queries.json")
-    company_seeds_path = os.getenv("COMPANY_SEEDS_CONFIG", "config/company_seeds.json")
+    name: str
+    title_keywords: Tuple[str, ...]
+    schedule: str
+    sources: Tuple[str, ...]
+    channel: str
+    webhook_url: str
 
-    with open(BASE_DIR / ats_path, "r", encoding="utf-8") as f:
-        ats_domains = json.load(f)
 
-    with open(BASE_DIR / base_queries_path, "r", encoding="utf-8") as f:
-        base_queries = json.load(f)
+_ENV_KEYS = (
+    "ATS_DOMAINS_CONFIG",
+    "BASE_QUERY_CONFIG",
+    "COMPANY_SEEDS_CONFIG",
+    "CLASSIFIER_MARKERS_CONFIG",
+    "ATS_BOARDS_CONFIG",
+    "DISCORD_WEBHOOK_URL",
+    "DISCORD_BOT_TOKEN",
+    "SEARCH_PROVIDER",
+    "SERPER_API_KEY",
+    "GOOGLE_CSE_ID",
+    "DATABASE_URL",
+    "TWITTER_BEARER_TOKEN",
+)
 
+_cached: Optional[Tuple[tuple, AppConfig]] = None
+_cache_lock = threading.Lock()
+# Parsed JSON per file, keyed on its stamp, so one edited file does not
+# force the others to be parsed again.
+_json_cache: Dict[Path, Tuple[tuple, Any]] = {}
+
+
+def _stamp(path: Path) -> Optional[tuple]:
+    # Atomic replaces (see config_store) always change the inode, even
+    # when two writes land within the filesystem's mtime resolution.
     try:
-        with open(BASE_DIR / company_seeds_path, "r", encoding="utf-8") as f:
-            company_seeds = json.load(f)
+        st = path.stat()
     except FileNotFoundError:
-        company_seeds = []
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _load_json(path: Path, default: Any = None) -> Any:
+    stamp = _stamp(path)
+    if stamp is None:
+        if default is None:
+            raise FileNotFoundError(path)
+        return default
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    _json_cache[path] = (stamp, data)
+    return data
+
+
+def _config_paths() -> Tuple[Path, Path, Path, Path, Path]:
+    return (
+        BASE_DIR / os.getenv("ATS_DOMAINS_CONFIG", "config/ats_domains.json"),
+        BASE_DIR / os.getenv("BASE_QUERY_CONFIG", "config/base_queries.json"),
+        BASE_DIR / os.getenv("COMPANY_SEEDS_CONFIG", "config/company_seeds.json"),
+        BASE_DIR / os.getenv("CLASSIFIER_MARKERS_CONFIG", "config/classifier_markers.json"),
+        BASE_DIR / os.getenv("ATS_BOARDS_CONFIG", "config/ats_boards.json"),
+    )
+
+
+def _fingerprint() -> tuple:
+    # Anything that can change what _read_config returns: the files' mtimes
+    # and the environment variables it reads.
+    env_path = BASE_DIR / ".env"
+    paths = (env_path,) + _config_paths()
+    return tuple(_stamp(path) for path in paths) + tuple(os.getenv(key) for key in _ENV_KEYS)
+
+
+def invalidate_config() -> None:
+    """Drop the cached config so the next ``load_config`` re-reads everything."""
+
+    global _cached
+    with _cache_lock:
+        _cached = None
+        _json_cache.clear()
+
+
+def load_config() -> AppConfig:
+    """Return the app config, re-reading it only when an input has changed.
+
+    The result is cached per process and reused while the .env file, the
+    JSON config files and the relevant environment variables are unchanged.
+    Callers must treat the returned object as read-only.
+    """
+
+    global _cached
+    with _cache_lock:
+        if _cached is None:
+            # .env must be loaded before the fingerprint sees its variables.
+            load_dotenv(BASE_DIR / ".env")
+        key = _fingerprint()
+        if _cached is not None and _cached[0] == key:
+            return _cached[1]
+
+        cfg = _read_config()
+        _cached = (key, cfg)
+        return cfg
+
+
+def _read_config() -> AppConfig:
+    load_dotenv(BASE_DIR / ".env")
+
+    ats_path, base_queries_path, company_seeds_path, markers_path, boards_path = _config_paths()
+
+    ats_domains = _load_json(ats_path)
+    base_queries = _load_json(base_queries_path)
+    company_seeds = _load_json(company_seeds_path, default=[])
+    classifier_markers = _load_json(markers_path, default={})
+    ats_boards = _load_json(boards_path, default={})
 
     return AppConfig(
         discord_webhook_url=os.getenv("DISCORD_WEBHOOK_URL", ""),
@@ -56,4 +168,43 @@ def load_config() -> AppConfig:
         base_queries=base_queries,
         company_seeds=company_seeds,
         twitter_bearer_token=os.getenv("TWITTER_BEARER_TOKEN"),
+        classifier_markers=classifier_markers,
+        ats_boards=ats_boards,
     )
+
+
+def scan_profiles(cfg: Optional[AppConfig] = None) -> List[ScanProfile]:
+    """Return every profile in base_queries.json, filling in defaults.
+
+    Defaults match the original single daily job: ATS sources only, at
+    DAILY_SUMMARY_HOUR_UTC, posting to DISCORD_WEBHOOK_URL. A profile whose
+    webhook variable is unset falls back to DISCORD_WEBHOOK_URL.
+    """
+
+    cfg = cfg or load_config()
+    default_schedule = f"0 {int(os.getenv('DAILY_SUMMARY_HOUR_UTC', '18'))} * * *"
+
+    profiles = []
+    for name, entry in cfg.base_queries.items():
+        sources = tuple(entry.get("sources", ["ats"]))
+        unknown = [source for source in sources if source not in SCAN_SOURCES]
+        if unknown:
+            raise ValueError(f"Profile {name!r} has unknown sources: {', '.join(unknown)}")
+
+        # Channel "" is the default webhook; otherwise the variable's name.
+        channel = entry.get("discord_webhook_env", "")
+        webhook_url = os.getenv(channel) if channel else None
+        if not webhook_url:
+            channel, webhook_url = "", cfg.discord_webhook_url
+
+        profiles.append(
+            ScanProfile(
+                name=name,
+                title_keywords=tuple(entry.get("title_keywords", [])),
+                schedule=entry.get("schedule", default_schedule),
+                sources=sources,
+                channel=channel,
+                webhook_url=webhook_url,
+            )
+        )
+    return profiles
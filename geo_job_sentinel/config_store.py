@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+from .config_loader import _config_paths, invalidate_config
+
+
+class ConfigStore:
+    """Serialised, atomic edits of the JSON config files.
+
+    Every ``update`` holds a cross-process lock file, writes through a temp
+    file that is renamed over the original (readers never see a partial
+    file) and bumps a version counter. Other processes can poll
+    ``version()`` or simply call ``load_config``, which only re-parses
+    files whose stamp changed.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self.ats_path, self.base_queries_path = _config_paths()[:2]
+        directory = Path(directory) if directory is not None else self.ats_path.parent
+        self.lock_path = directory / ".config.lock"
+        self.version_path = directory / ".config.version"
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        # flock is per open file, so threads of one process also need a lock.
+        with self._thread_lock:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a+b") as handle:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                else:  # pragma: no cover - Windows
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                    else:  # pragma: no cover - Windows
+                        handle.seek(0)
+                        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def version(self) -> int:
+        """Number of committed updates; 0 before the first one."""
+
+        try:
+            return int(self.version_path.read_text(encoding="utf-8").strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def read(self, path: Path, default: Any = None) -> Any:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            if default is None:
+                raise
+            return default
+
+    def update(self, path: Path, mutate: Callable[[Any], bool], default: Any = None) -> bool:
+        """Apply ``mutate`` to the parsed contents of ``path`` under the lock.
+
+        ``mutate`` edits the data in place and returns whether it changed
+        anything; only then is the file rewritten and the version bumped.
+        """
+
+        with self.locked():
+            data = self.read(path, default)
+            if not mutate(data):
+                return False
+            _write_atomic(path, json.dumps(data, indent=2))
+            _write_atomic(self.version_path, str(self.version() + 1))
+        invalidate_config()
+        return True
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        if path.exists():
+            # mkstemp creates 0600 files; keep the original permissions.
+            os.chmod(tmp, stat.S_IMODE(path.stat().st_mode))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
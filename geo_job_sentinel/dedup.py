@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import JobPosting
+from .urls import ats_posting_url, normalize_url
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+FINGERPRINT_BITS = 64
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word bigrams; similar texts get nearby fingerprints."""
+
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return 0
+    features = [" ".join(pair) for pair in zip(tokens, tokens[1:])] or tokens
+
+    # Count set bits per position; a bit is set in the fingerprint when more
+    # than half of the features have it set.
+    ones = [0] * FINGERPRINT_BITS
+    for feature in features:
+        for position, bit in enumerate(format(_hash64(feature), "064b")):
+            if bit == "1":
+                ones[position] += 1
+
+    half = len(features) / 2
+    return int("".join("1" if count > half else "0" for count in ones), 2)
+
+
+def job_fingerprint(job: JobPosting) -> int:
+    # Location is included so one role posted for several offices (often with
+    # an empty or boilerplate snippet) is not mistaken for a single job.
+    parts = [job.title or "", job.company or "", job.location or "", job.description_snippet or ""]
+    return simhash(" ".join(parts))
+
+
+class NearDuplicateIndex:
+    """In-memory SimHash index answering "is there a fingerprint within k bits?".
+
+    Fingerprints are split into ``max_distance + 1`` bands; by pigeonhole any
+    fingerprint within ``max_distance`` bits shares at least one band exactly,
+    so each lookup only compares against a handful of bucket candidates and a
+    whole scan stays roughly O(n).
+    """
+
+    def __init__(self, max_distance: int = 3) -> None:
+        self.max_distance = max_distance
+        self._bands = max_distance + 1
+        self._width = FINGERPRINT_BITS // self._bands
+        self._buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
+    def _band_keys(self, fingerprint: int) -> Iterable[Tuple[int, int]]:
+        mask = (1 << self._width) - 1
+        for band in range(self._bands):
+            yield band, (fingerprint >> (band * self._width)) & mask
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        for key in self._band_keys(fingerprint):
+            for candidate in self._buckets.get(key, ()):
+                if (candidate ^ fingerprint).bit_count() <= self.max_distance:
+                    return candidate
+        return None
+
+    def add(self, fingerprint: int) -> None:
+        for key in self._band_keys(fingerprint):
+            self._buckets[key].append(fingerprint)
+
+
+class JobDeduplicator:
+    """Cross-source dedup on canonical URL first, then near-duplicate content.
+
+    Two jobs with different ATS posting URLs are distinct postings by
+    definition, so a job with an ATS posting URL is only checked for near
+    duplicates against jobs without one (aggregator copies, tweets, etc.).
+    """
+
+    def __init__(self, ats_domains: Optional[Iterable[str]] = None, max_distance: int = 3) -> None:
+        self.ats_domains = list(ats_domains) if ats_domains is not None else None
+        self._seen_urls: set[str] = set()
+        self._index = NearDuplicateIndex(max_distance=max_distance)
+        # Only jobs without an ATS posting URL.
+        self._off_ats_index = NearDuplicateIndex(max_distance=max_distance)
+        self.url_duplicates = 0
+        self.near_duplicates = 0
+
+    def is_duplicate(self, job: JobPosting) -> bool:
+        """Return True if ``job`` duplicates an earlier one; otherwise record it."""
+
+        posting_url = ats_posting_url(job.url, self.ats_domains)
+        key = posting_url or normalize_url(job.url) or job.id
+        if key in self._seen_urls:
+            self.url_duplicates += 1
+            return True
+
+        fingerprint = job_fingerprint(job)
+        candidates = self._off_ats_index if posting_url else self._index
+        if fingerprint and candidates.find(fingerprint) is not None:
+            self.near_duplicates += 1
+            return True
+
+        self._seen_urls.add(key)
+        if fingerprint:
+            self._index.add(fingerprint)
+            if not posting_url:
+                self._off_ats_index.add(fingerprint)
+        return False
+
+    def unique(self, jobs: Iterable[JobPosting]) -> List[JobPosting]:
+        return [job for job in jobs if not self.is_duplicate(job)]
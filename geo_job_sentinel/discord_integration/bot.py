@@ -1,41 +1,170 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import logging
 import os
-from pathlib import Path
-from typing import List
+import shlex
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 
 import discord
 from discord.ext import commands
 
-from ..config_loader import BASE_DIR, load_config
-from ..search.pipeline import run_gis_scan
-from .webhook import send_job_card, send_summary
-
-
-def _config_paths() -> tuple[Path, Path]:
-    ats_path = os.getenv("ATS_DOMAINS_CONFIG", "config/ats_domains.json")
-    base_queries_path = os.getenv("BASE_QUERY_CONFIG", "config/base_queries.json")
-    return BASE_DIR / ats_path, BASE_DIR / base_queries_path
-
-
-def _load_json(path: Path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
+from ..config_loader import DEFAULT_PROFILE, load_config
+from ..config_store import ConfigStore
+from ..models import JobPosting, LocationType
+from ..search.pipeline import run_gis_scan, stream_full_scan
+from ..storage.job_index import JobIndex
+from .delivery import DeliveryQueue, DeliveryReport
+from .webhook import send_summary
+
+
+logger = logging.getLogger("geo_job_sentinel.bot")
+
+
+class _ScanFlight:
+    """One on-demand scan, shared by every ``scan_now`` caller while it runs.
+
+    The scan and delivery run on a worker thread; the event loop only edits
+    each caller's status message every SCAN_PROGRESS_INTERVAL_SECONDS
+    (default 5). ``cancel`` stops the scan after the current batch; cards
+    not yet posted stay in the outbox for the next run.
+    """
+
+    def __init__(self) -> None:
+        self.messages: List[discord.Message] = []
+        self.found = 0
+        self._cancelled = threading.Event()
+        self._queue: Optional[DeliveryQueue] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def _scan(self) -> Tuple[List[JobPosting], dict, DeliveryReport]:
+        stats: dict = {}
+        jobs: List[JobPosting] = []
+        queue = self._queue = DeliveryQueue.from_config().start()
+        batches = stream_full_scan(stats, sources=[("ats", run_gis_scan)])
+        try:
+            for batch in batches:
+                jobs.extend(batch)
+                self.found = len(jobs)
+                queue.submit(batch)
+                if self._cancelled.is_set():
+                    break
+            # Flush in short slices so a cancel also stops delivery.
+            while not self._cancelled.is_set():
+                queue.flush(timeout=0.5)
+                if queue.idle:
+                    break
+        finally:
+            batches.close()
+            queue.stop()
+            queue.report.pending = queue.outbox.pending_count()
+            queue.outbox.close()
+
+        if not self._cancelled.is_set():
+            send_summary(jobs, stats)
+        return jobs, stats, queue.report
+
+    def _progress(self) -> str:
+        sent = self._queue.report.sent if self._queue is not None else 0
+        state = "Cancelling" if self._cancelled.is_set() else "Scanning"
+        return f"{state}… {self.found} new jobs so far, {sent} posted."
+
+    async def _publish(self, text: str) -> None:
+        for message in list(self.messages):
+            try:
+                await message.edit(content=text)
+            except discord.HTTPException:
+                logger.warning("Could not update scan status message %s", message.id)
+
+    async def run(self) -> None:
+        interval = float(os.getenv("SCAN_PROGRESS_INTERVAL_SECONDS", "5"))
+        future = asyncio.get_running_loop().run_in_executor(None, self._scan)
+        while not future.done():
+            await asyncio.wait({future}, timeout=interval)
+            if not future.done():
+                await self._publish(self._progress())
+
+        try:
+            jobs, stats, report = future.result()
+        except Exception as exc:
+            logger.exception("On-demand scan failed")
+            await self._publish(f"Scan failed: {exc}")
+            return
 
-def _save_json(path: Path, data) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+        if self._cancelled.is_set():
+            text = f"Scan cancelled after {len(jobs)} new jobs; {report.sent} posted, the rest stay queued."
+        else:
+            text = (
+                f"Scan complete. Found {stats.get('new_jobs', len(jobs))} new jobs; "
+                f"{report.sent} posted in {report.messages} messages"
+                + (f", {report.pending} queued for retry." if report.pending else ".")
+            )
+        await self._publish(text)
+
+
+_SEARCH_USAGE = (
+    "Usage: `!geo search [remote|hybrid|onsite] [category:NAME] [source:NAME] [days:N] [limit:N] [words…]`, "
+    'e.g. `!geo search remote days:7 GIS Developer` or `!geo search category:"General GIS" python`.'
+)
+# Larger ``days:`` values would overflow ``datetime``; the index is far younger anyway.
+_SEARCH_MAX_DAYS = 3650.0
+
+
+def _parse_search(query: str) -> dict:
+    """Turn ``!geo search`` arguments into ``JobIndex.search`` keyword arguments."""
+
+    options: dict = {"limit": 10}
+    words: List[str] = []
+    for token in shlex.split(query):
+        name, sep, value = token.partition(":")
+        name = name.lower()
+        if token.lower() in {kind.value for kind in LocationType}:
+            options["location_type"] = LocationType(token.lower())
+        elif sep and name in ("category", "source"):
+            options[name] = value
+        elif sep and name == "days":
+            days = max(0.0, min(float(value), _SEARCH_MAX_DAYS))
+            options["since"] = datetime.utcnow() - timedelta(days=days)
+        elif sep and name == "limit":
+            options["limit"] = max(1, min(int(value), 25))
+        else:
+            words.append(token)
+    options["text"] = " ".join(words)
+    return options
+
+
+def _format_results(jobs: List[JobPosting]) -> str:
+    lines = []
+    for job in jobs:
+        lines.append(
+            f"**{job.title[:100]}** — {job.company} ({job.location}, {job.location_type.value}) · "
+            f"{job.category} · {job.source} · {job.discovered_at:%Y-%m-%d}"
+            + (f" · {job.salary}" if job.salary else "")
+            + f"\n<{job.url}>"
+        )
+    text = "\n".join(lines)
+    # Discord caps messages at 2000 characters.
+    while len(text) > 1900 and lines:
+        lines.pop()
+        text = "\n".join(lines) + "\n…"
+    return text
 
 
 def create_bot() -> commands.Bot:
     intents = discord.Intents.default()
     bot = commands.Bot(command_prefix="!geo ", intents=intents, help_command=None)
 
-    ats_path, base_queries_path = _config_paths()
+    store = ConfigStore()
+    index: Optional[JobIndex] = None
 
     @bot.command(name="add_ats")
     @commands.has_permissions(administrator=True)
@@ -43,18 +172,27 @@ def create_bot() -> commands.Bot:
         """Add a new ATS domain (e.g. jobs.exampleats.com)."""
 
         domain = domain.strip()
-        ats_list: List[str] = _load_json(ats_path)
-        if domain in ats_list:
+        total = 0
+
+        def add(ats_list: List[str]) -> bool:
+            nonlocal total
+            total = len(ats_list)
+            if domain in ats_list:
+                return False
+            ats_list.append(domain)
+            total += 1
+            return True
+
+        # The store may wait on another process's lock; keep it off the loop.
+        if not await asyncio.to_thread(store.update, store.ats_path, add):
             await ctx.reply(f"`{domain}` is already in the ATS list.")
             return
 
-        ats_list.append(domain)
-        _save_json(ats_path, ats_list)
-        await ctx.reply(f"Added new ATS domain: `{domain}` (total {len(ats_list)})")
+        await ctx.reply(f"Added new ATS domain: `{domain}` (total {total})")
 
     @bot.command(name="list_ats")
     async def list_ats(ctx: commands.Context):
-        ats_list: List[str] = _load_json(ats_path)
+        ats_list: List[str] = load_config().ats_domains
         preview = ", ".join(ats_list[:20])
         more = "" if len(ats_list) <= 20 else f" … (+{len(ats_list)-20} more)"
         await ctx.reply(f"Configured ATS domains ({len(ats_list)}): {preview}{more}")
@@ -64,10 +202,6 @@ def create_bot() -> commands.Bot:
     async def add_keyword(ctx: commands.Context, *, keyword: str):
         """Add a new GIS title keyword to the default search stack."""
 
-        base_queries = _load_json(base_queries_path)
-        cfg = base_queries.setdefault("gis_default", {})
-        titles: List[str] = cfg.setdefault("title_keywords", [])
-
         # Ensure quotes for Boolean search
         if not (keyword.startswith("\"") and keyword.endswith("\"")):
             display = keyword
@@ -75,37 +209,78 @@ def create_bot() -> commands.Bot:
         else:
             display = keyword.strip("\"")
 
-        if keyword in titles:
+        total = 0
+
+        def add(base_queries: dict) -> bool:
+            nonlocal total
+            titles: List[str] = base_queries.setdefault(DEFAULT_PROFILE, {}).setdefault("title_keywords", [])
+            total = len(titles)
+            if keyword in titles:
+                return False
+            titles.append(keyword)
+            total += 1
+            return True
+
+        if not await asyncio.to_thread(store.update, store.base_queries_path, add):
             await ctx.reply(f"Keyword `{display}` already exists.")
             return
 
-        titles.append(keyword)
-        _save_json(base_queries_path, base_queries)
-        await ctx.reply(f"Added keyword `{display}`. Total title keywords: {len(titles)}")
+        await ctx.reply(f"Added keyword `{display}`. Total title keywords: {total}")
 
     @bot.command(name="list_keywords")
     async def list_keywords(ctx: commands.Context):
-        base_queries = _load_json(base_queries_path)
-        titles: List[str] = base_queries.get("gis_default", {}).get("title_keywords", [])
+        titles: List[str] = load_config().base_queries.get(DEFAULT_PROFILE, {}).get("title_keywords", [])
         await ctx.reply("Current GIS title keywords:\n" + "\n".join(titles))
 
+    flight: Optional[_ScanFlight] = None
+
     @bot.command(name="scan_now")
     @commands.has_permissions(administrator=True)
     async def scan_now(ctx: commands.Context):
-        """Trigger an immediate GIS scan and send cards + summary."""
+        """Trigger an immediate GIS scan and send cards + summary.
 
-        await ctx.reply("Starting on-demand GIS scan… this may take a minute.")
+        Callers while a scan is running follow that scan instead of
+        starting another one.
+        """
 
-        loop = asyncio.get_running_loop()
-        jobs, stats = await loop.run_in_executor(None, run_gis_scan)
+        nonlocal flight
+        if flight is not None and flight.running:
+            flight.messages.append(await ctx.reply("A scan is already running; following it here…"))
+            return
 
-        for job in jobs:
-            # Use webhook formatting for consistency
-            send_job_card(job)
+        flight = _ScanFlight()
+        flight.messages.append(await ctx.reply("Starting on-demand GIS scan… this may take a minute."))
+        flight.task = asyncio.create_task(flight.run())
 
-        send_summary(jobs, stats)
+    @bot.command(name="scan_cancel")
+    @commands.has_permissions(administrator=True)
+    async def scan_cancel(ctx: commands.Context):
+        """Stop the running on-demand scan after its current batch."""
 
-        await ctx.reply(f"Scan complete. Found {stats.get('new_jobs', len(jobs))} jobs.")
+        if flight is None or not flight.running:
+            await ctx.reply("No scan is running.")
+            return
+        flight.cancel()
+        await ctx.reply("Cancelling the running scan…")
+
+    @bot.command(name="search")
+    async def search(ctx: commands.Context, *, query: str = ""):
+        """Search jobs found by earlier scans; answered from the local index."""
+
+        nonlocal index
+        try:
+            options = _parse_search(query)
+        except (ValueError, OverflowError):
+            await ctx.reply(_SEARCH_USAGE)
+            return
+        if index is None:
+            index = JobIndex(load_config().database_url)
+
+        jobs = await asyncio.to_thread(index.search, **options)
+        if not jobs:
+            await ctx.reply("No matching jobs in the index.\n" + _SEARCH_USAGE)
+            return
+        await ctx.reply(_format_results(jobs))
 
     @bot.command(name="config")
     async def show_config(ctx: commands.Context):
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+import requests
+
+from .. import transport
+from ..classifier import get_classifier
+from ..config_loader import load_config
+from ..metrics import metrics
+from ..models import JobPosting
+from ..storage.db import connect
+from ..storage.seen_jobs import job_key
+from .webhook import build_job_embed
+
+
+logger = logging.getLogger("geo_job_sentinel.delivery")
+
+# Discord accepts at most 10 embeds per webhook message, with at most 6000
+# characters of text across all of them.
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+
+def embed_chars(embed: dict) -> int:
+    """Characters of ``embed`` that count towards Discord's per-message total."""
+
+    texts = [
+        embed.get("title", ""),
+        embed.get("description", ""),
+        (embed.get("footer") or {}).get("text", ""),
+        (embed.get("author") or {}).get("name", ""),
+    ]
+    for field in embed.get("fields", []):
+        texts += [field.get("name", ""), field.get("value", "")]
+    return sum(len(text) for text in texts)
+
+
+class DiscordOutbox:
+    """Durable queue of job embeds waiting to be posted to the webhook.
+
+    Embeds stay in the outbox until Discord accepts them, so a crash or a
+    rate-limited run is retried by the next delivery attempt. Failed sends
+    back off exponentially and are parked as ``dead`` after
+    OUTBOX_MAX_ATTEMPTS (default 10). Each ``channel`` (one per Discord
+    webhook, "" for the default) has its own rows in the shared table.
+    Several processes may drain the same channel: ``due_batch`` hides the
+    rows it returns for OUTBOX_LEASE_SECONDS (default 60) so they are not
+    sent twice.
+    """
+
+    def __init__(self, database_url: str, channel: str = "") -> None:
+        self.channel = channel
+        self.max_attempts = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+        self.lease_seconds = float(os.getenv("OUTBOX_LEASE_SECONDS", "60"))
+        self._conn = connect(database_url)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS discord_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel TEXT NOT NULL DEFAULT '',
+                    job_key TEXT NOT NULL,
+                    embed TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    UNIQUE (channel, job_key)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_discord_outbox_channel_due "
+                "ON discord_outbox (channel, status, next_attempt_at)"
+            )
+
+    def enqueue(self, jobs: Iterable[JobPosting]) -> int:
+        jobs = list(jobs)
+        with metrics.timer("classify", batch="outbox"):
+            classifications = get_classifier().classify_batch(jobs)
+        now = time.time()
+        rows = [
+            (self.channel, job_key(job), json.dumps(build_job_embed(job, classification)), now)
+            for job, classification in zip(jobs, classifications)
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO discord_outbox (channel, job_key, embed, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return self._conn.total_changes - before
+
+    def due_batch(
+        self, limit: int = MAX_EMBEDS_PER_MESSAGE, max_chars: int = MAX_EMBED_CHARS_PER_MESSAGE
+    ) -> List[Tuple[int, dict]]:
+        """Lease the oldest due embeds that fit in one message.
+
+        Stops before the embed that would take the batch past ``max_chars``
+        (``embed_chars``), but always returns at least one.
+        """
+
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "SELECT id, embed FROM discord_outbox WHERE channel = ? AND status = 'pending' "
+                "AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (self.channel, now, limit),
+            ).fetchall()
+            batch: List[Tuple[int, dict]] = []
+            chars = 0
+            for row_id, embed in rows:
+                embed = json.loads(embed)
+                chars += embed_chars(embed)
+                if batch and chars > max_chars:
+                    break
+                batch.append((row_id, embed))
+            # Leased until mark_sent / mark_failed, or until it expires if we die.
+            self._conn.executemany(
+                "UPDATE discord_outbox SET next_attempt_at = ? WHERE id = ?",
+                [(now + self.lease_seconds, row_id) for row_id, _ in batch],
+            )
+        return batch
+
+    def mark_sent(self, ids: List[int]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM discord_outbox WHERE id = ?", [(i,) for i in ids])
+
+    def mark_failed(self, ids: List[int], error: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            for row_id in ids:
+                self._conn.execute(
+                    """
+                    UPDATE discord_outbox SET
+                        attempts = attempts + 1,
+                        last_error = ?,
+                        next_attempt_at = ? + MIN(300, 5 * (1 << attempts)),
+                        status = CASE WHEN attempts + 1 >= ? THEN 'dead' ELSE 'pending' END
+                    WHERE id = ?
+                    """,
+                    (error[:500], now, self.max_attempts, row_id),
+                )
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM discord_outbox WHERE channel = ? AND status = 'pending'",
+                (self.channel,),
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class _WebhookBucket:
+    """Tracks Discord's per-webhook rate-limit bucket from response headers."""
+
+    def __init__(self) -> None:
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+
+    def wait(self) -> float:
+        if self.remaining is None or self.remaining > 0:
+            return 0.0
+        delay = max(self.reset_at - time.monotonic(), 0.0)
+        if delay:
+            metrics.inc("rate_limit_wait_seconds_total", delay, limiter="discord_webhook")
+            time.sleep(delay)
+        self.remaining = None
+        return delay
+
+    def update(self, resp: requests.Response) -> None:
+        try:
+            self.remaining = int(resp.headers["X-RateLimit-Remaining"])
+            self.reset_at = time.monotonic() + float(resp.headers["X-RateLimit-Reset-After"])
+        except (KeyError, ValueError):
+            self.remaining = None
+
+
+@dataclass
+class DeliveryReport:
+    sent: int = 0
+    messages: int = 0
+    failed: int = 0
+    pending: int = 0
+
+
+class DeliveryQueue:
+    """Background sender that drains the outbox in batches of up to 10 embeds.
+
+    ``submit`` persists jobs and returns immediately; a worker thread posts
+    them while honouring the webhook's rate-limit headers. ``flush`` waits
+    until everything currently due has been attempted.
+    """
+
+    def __init__(self, webhook_url: str, outbox: DiscordOutbox) -> None:
+        if not webhook_url:
+            raise RuntimeError("DISCORD_WEBHOOK_URL not configured")
+        self.webhook_url = webhook_url
+        self.outbox = outbox
+        self.report = DeliveryReport()
+        self._bucket = _WebhookBucket()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, webhook_url: Optional[str] = None, channel: str = "") -> "DeliveryQueue":
+        cfg = load_config()
+        return cls(webhook_url or cfg.discord_webhook_url, DiscordOutbox(cfg.database_url, channel))
+
+    def start(self) -> "DeliveryQueue":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="discord-delivery", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, jobs: Iterable[JobPosting]) -> int:
+        added = self.outbox.enqueue(jobs)
+        self._idle.clear()
+        self._wake.set()
+        return added
+
+    def flush(self, timeout: Optional[float] = None) -> DeliveryReport:
+        if self._thread is None:
+            self.drain()
+            self.report.pending = self.outbox.pending_count()
+            return self.report
+        self._idle.clear()
+        self._wake.set()
+        self._idle.wait(timeout)
+        self.report.pending = self.outbox.pending_count()
+        return self.report
+
+    @property
+    def idle(self) -> bool:
+        """True once everything submitted so far has been attempted."""
+
+        return self._idle.is_set()
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.drain()
+            except Exception:  # pragma: no cover - keep the worker alive
+                logger.exception("Discord delivery worker failed")
+            if not self._wake.is_set():
+                self._idle.set()
+
+    def drain(self) -> DeliveryReport:
+        """Send every due outbox entry now, on the calling thread."""
+
+        while not self._stopped:
+            batch = self.outbox.due_batch()
+            if not batch:
+                break
+            self._send(batch)
+
+        return self.report
+
+    def _send(self, batch: List[Tuple[int, dict]]) -> None:
+        ids = [row_id for row_id, _ in batch]
+        self._bucket.wait()
+        payload = {"username": "GeoJob-Sentinel", "embeds": [embed for _, embed in batch]}
+        try:
+            with metrics.timer("webhook_send"):
+                resp = transport.post(self.webhook_url, params={"wait": "true"}, json=payload, timeout=20)
+        except requests.RequestException as exc:
+            self.outbox.mark_failed(ids, str(exc))
+            self.report.failed += len(ids)
+            return
+
+        self._bucket.update(resp)
+        if resp.status_code < 300:
+            self.outbox.mark_sent(ids)
+            self.report.sent += len(ids)
+            self.report.messages += 1
+            return
+
+        logger.warning("Discord webhook returned %s: %s", resp.status_code, resp.text[:200])
+        if 400 <= resp.status_code < 500 and resp.status_code != 429 and len(batch) > 1:
+            # Discord rejects the whole message for one bad embed; send them
+            # one by one so only the bad one uses up its attempts.
+            for entry in batch:
+                self._send([entry])
+            return
+        self.outbox.mark_failed(ids, f"HTTP {resp.status_code}")
+        self.report.failed += len(ids)
+
+
+def deliver_batches(
+    batches: Iterable[List[JobPosting]],
+    timeout: Optional[float] = None,
+    webhook_url: Optional[str] = None,
+    channel: str = "",
+) -> DeliveryReport:
+    """Queue each batch as soon as it arrives and wait for delivery at the end.
+
+    Delivery overlaps with whatever produces ``batches`` (e.g.
+    ``stream_full_scan``); leftovers from earlier runs are sent too. Pass
+    ``webhook_url``/``channel`` to post somewhere other than the default
+    webhook.
+    """
+
+    queue = DeliveryQueue.from_config(webhook_url, channel).start()
+    try:
+        for batch in batches:
+            queue.submit(batch)
+        return queue.flush(timeout)
+    finally:
+        queue.stop()
+        queue.outbox.close()
+
+
+def deliver_jobs(
+    jobs: Iterable[JobPosting],
+    timeout: Optional[float] = None,
+    webhook_url: Optional[str] = None,
+    channel: str = "",
+) -> DeliveryReport:
+    """Queue ``jobs`` (plus any leftovers from earlier runs) and wait for delivery."""
+
+    return deliver_batches([list(jobs)], timeout, webhook_url, channel)
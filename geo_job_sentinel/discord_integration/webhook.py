@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Iterable
-
-import requests
+from typing import Iterable, Optional
 
+from .. import transport
+from ..classifier import Classification, get_classifier
 from ..config_loader import load_config
 from ..models import JobPosting, LocationType
 
@@ -19,31 +19,21 @@ def _location_type_emoji(location_type: LocationType) -> str:
     return "❓ Unknown"
 
 
-def _category_label(job: JobPosting) -> str:
-    text = " ".join(
-        [job.title.lower(), job.company.lower(), job.description_snippet.lower()]
-    )
-    url = (job.url or "").lower()
-
-    government_markers = [" county", " city", " government", ".gov"]
-    if any(m in text for m in government_markers) or any(m in url for m in [".gov", "county"]):
+def _category_label(category: str) -> str:
+    if category == "Government":
         return "🏛️ Government"
+    return f"📊 {category}"
 
-    return "📊 General GIS"
 
+_FRESHNESS_LABELS = {
+    "fresh": "🟢 Fresh",
+    "standard": "🔵 Standard",
+    "older": "🟠 Older",
+}
 
-def _freshness_label(job: JobPosting) -> str:
-    date_text = ""
-    if job.raw_source:
-        date_text = str(job.raw_source.get("date", "")).lower()
 
-    if any(k in date_text for k in ["hour", "minute", "today"]):
-        return "🟢 Fresh"
-    if any(k in date_text for k in ["day", "yesterday"]):
-        return "🔵 Standard"
-    if date_text:
-        return "🟠 Older"
-    return "🔵 Standard"
+def _freshness_label(freshness: str) -> str:
+    return _FRESHNESS_LABELS.get(freshness, "🔵 Standard")
 
 
 def _competition_label(job: JobPosting) -> str:
@@ -53,52 +43,69 @@ def _competition_label(job: JobPosting) -> str:
     return "🟢 Low Competition (~10-30 applicants)"
 
 
-def send_job_card(job: JobPosting) -> None:
-    cfg = load_config()
-    if not cfg.discord_webhook_url:
-        raise RuntimeError("DISCORD_WEBHOOK_URL not configured")
+def build_job_embed(job: JobPosting, classification: Optional[Classification] = None) -> dict:
+    """Render a job as a Discord embed; up to 10 fit in one webhook message.
 
-    header = ""
-    if job.is_new_company:
-        header = f"🆕 NEW COMPANY! {job.company}\n"
-
-    content = (
-        f"{header}**{job.title}**\n"
-        f"{job.description_snippet[:280]}...\n\n"
-        f"🏢 Company\n{job.company}\n"
-        f"📍 Location\n{job.location}\n"
-        f"🔍 Source\n{job.source}\n"
-        f"📂 Category\n{_category_label(job)}\n"
-        f"⏰ Freshness\n{_freshness_label(job)}\n"
-        f"👥 Competition\n{_competition_label(job)}\n"
-        f"🏷️ Type\n{_location_type_emoji(job.location_type)}\n\n"
-        f"🔗 {job.url}"
-    )
+    Pass ``classification`` when rendering many jobs to classify them in one
+    ``classify_batch`` call.
+    """
 
-    payload = {
-        "username": "GeoJob-Sentinel",
-        "content": content,
+    classification = classification or get_classifier().classify(job)
+
+    title = job.title
+    if job.is_new_company:
+        title = f"🆕 NEW COMPANY! {job.title}"
+
+    fields = [
+        ("🏢 Company", job.company),
+        ("📍 Location", job.location),
+        ("🔍 Source", job.source),
+        ("📂 Category", _category_label(classification.category)),
+        ("⏰ Freshness", _freshness_label(classification.freshness)),
+        ("👥 Competition", _competition_label(job)),
+        ("🏷️ Type", _location_type_emoji(job.location_type)),
+    ]
+    if job.salary:
+        fields.append(("💰 Salary", job.salary))
+
+    embed = {
+        "title": title[:256],
+        "description": f"{job.description_snippet[:280]}...",
+        "fields": [
+            {"name": name, "value": (value or "Unknown")[:1024], "inline": True}
+            for name, value in fields
+        ],
     }
+    if job.url.startswith("http"):
+        embed["url"] = job.url
+    return embed
 
-    resp = requests.post(cfg.discord_webhook_url, json=payload, timeout=20)
-    if resp.status_code == 429:
-        # Hit Discord rate limit for this webhook; skip this card instead of failing the run.
-        return
-    resp.raise_for_status()
+
+def _metric_label(series: str) -> str:
+    # 'provider_call{provider="serper"}' -> 'provider_call (provider=serper)'
+    return series.replace("{", " (").replace("}", ")").replace('"', "")
 
 
-def send_summary(jobs: Iterable[JobPosting], stats: dict) -> None:
+def send_summary(jobs: Iterable[JobPosting], stats: dict, webhook_url: Optional[str] = None) -> None:
     cfg = load_config()
-    if not cfg.discord_webhook_url:
+    webhook_url = webhook_url or cfg.discord_webhook_url
+    if not webhook_url:
         raise RuntimeError("DISCORD_WEBHOOK_URL not configured")
 
     jobs = list(jobs)
     lines = [
-        "📊 **GeoJob-Sentinel Scan Summary**",
+        "📊 **GeoJob-Sentinel Scan Summary**"
+        + (f" ({stats['profile']})" if stats.get("profile") else ""),
         f"New Jobs Found: **{stats.get('new_jobs', len(jobs))}**",
         f"Total Scanned: **{stats.get('total_scanned', len(jobs))}**",
         f"Duplicates Filtered: **{stats.get('duplicates_filtered', 0)}**",
     ]
+    if stats.get("irrelevant"):
+        lines.append(f"Off-keyword Postings: {stats['irrelevant']}")
+
+    cache = stats.get("cache")
+    if cache and (cache.get("hits") or cache.get("misses")):
+        lines.append(f"Search Cache: {cache.get('hits', 0)} hits / {cache.get('misses', 0)} misses")
 
     by_source = stats.get("by_source", {})
     if by_source:
@@ -106,12 +113,34 @@ def send_summary(jobs: Iterable[JobPosting], stats: dict) -> None:
         for source, count in by_source.items():
             lines.append(f"- {source}: {count}")
 
+    failed_sources = stats.get("failed_sources", {})
+    if failed_sources:
+        lines.append("Skipped Sources:")
+        for source, reason in failed_sources.items():
+            lines.append(f"- {source}: {reason}")
+
+    # Per-run delta from geo_job_sentinel.metrics, slowest stages first.
+    run_metrics = stats.get("metrics")
+    if run_metrics:
+        stages = sorted(
+            run_metrics.get("stages", {}).items(), key=lambda item: item[1]["seconds"], reverse=True
+        )
+        if stages:
+            lines.append("Time by Stage:")
+            for series, entry in stages[:8]:
+                lines.append(f"- {_metric_label(series)}: {entry['seconds']:.1f}s over {entry['count']} calls")
+        counters = run_metrics.get("counters", {})
+        retries = sum(v for k, v in counters.items() if k.startswith("http_retries_total"))
+        waited = sum(v for k, v in counters.items() if k.startswith("rate_limit_wait_seconds_total"))
+        if retries or waited:
+            lines.append(f"HTTP Retries: {retries:g} / Rate-limit Waits: {waited:.1f}s")
+
     payload = {
         "username": "GeoJob-Sentinel",
         "content": "\n".join(lines),
     }
 
-    resp = requests.post(cfg.discord_webhook_url, json=payload, timeout=20)
+    resp = transport.post(webhook_url, json=payload, timeout=20)
     if resp.status_code == 429:
         return
     resp.raise_for_status()
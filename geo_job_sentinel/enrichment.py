@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:  # pragma: no cover - optional dependency
+    BeautifulSoup = None
+
+from . import transport
+from .classifier import ClassifierEngine, get_classifier
+from .metrics import metrics
+from .models import JobPosting
+from .search.limits import provider_bucket, provider_concurrency, provider_slot
+from .storage.page_cache import PageCache
+
+
+logger = logging.getLogger("geo_job_sentinel.enrichment")
+
+# Pages that need a browser (or a login) to show the posting.
+_SKIP_HOSTS = ("twitter.com", "x.com", "linkedin.com")
+
+_SALARY_RE = re.compile(
+    r"(?:[$£€]\s?\d[\d,.]*\s?[kK]?(?:\s?(?:-|–|to)\s?[$£€]?\s?\d[\d,.]*\s?[kK]?)?)"
+    r"(?:\s?(?:per|/|an?)\s?(?:year|yr|annum|hour|hr))?"
+)
+
+
+def enrichment_enabled() -> bool:
+    """ENRICH_PAGES=1 turns the stage on; it needs beautifulsoup4."""
+
+    if os.getenv("ENRICH_PAGES", "0") in ("0", "false", "no", ""):
+        return False
+    if BeautifulSoup is None:
+        logger.warning("ENRICH_PAGES is set but beautifulsoup4 is not installed; skipping enrichment")
+        return False
+    return True
+
+
+def _skipped(url: str) -> bool:
+    host = (urlsplit(url).hostname or "").lower()
+    return not url.startswith("http") or any(host == h or host.endswith("." + h) for h in _SKIP_HOSTS)
+
+
+def _text(html: str) -> str:
+    return " ".join(BeautifulSoup(html, "html.parser").get_text(" ").split())
+
+
+def _job_posting_ld(soup) -> Optional[dict]:
+    # schema.org JobPosting, which most ATS pages embed for Google for Jobs.
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        candidates = data if isinstance(data, list) else data.get("@graph", [data])
+        for item in candidates:
+            if isinstance(item, dict) and item.get("@type") == "JobPosting":
+                return item
+    return None
+
+
+def _ld_location(posting: dict) -> Optional[str]:
+    if str(posting.get("jobLocationType", "")).upper() == "TELECOMMUTE":
+        return "Remote"
+    places = posting.get("jobLocation") or []
+    places = places if isinstance(places, list) else [places]
+    names = []
+    for place in places:
+        address = (place or {}).get("address") or {}
+        if isinstance(address, str):
+            names.append(address)
+            continue
+        country = address.get("addressCountry")
+        if isinstance(country, dict):
+            country = country.get("name")
+        name = ", ".join(p for p in (address.get("addressLocality"), address.get("addressRegion"), country) if p)
+        if name:
+            names.append(name)
+    return "; ".join(dict.fromkeys(names)) or None
+
+
+def _ld_salary(posting: dict) -> Optional[str]:
+    salary = posting.get("baseSalary") or posting.get("estimatedSalary")
+    if isinstance(salary, list):
+        salary = salary[0] if salary else None
+    if not isinstance(salary, dict):
+        return str(salary) if salary else None
+    value = salary.get("value")
+    unit = None
+    if isinstance(value, dict):
+        unit = value.get("unitText")
+        low, high = value.get("minValue"), value.get("maxValue")
+        value = f"{low}–{high}" if low and high and low != high else low or high or value.get("value")
+    if not value:
+        return None
+    parts = [salary.get("currency"), str(value), f"per {unit.lower()}" if unit else None]
+    return " ".join(part for part in parts if part)
+
+
+def parse_job_page(html: str) -> dict:
+    """Extract location, salary, posted date and description from a posting page.
+
+    Prefers the schema.org ``JobPosting`` JSON-LD block and falls back to
+    meta tags and page text. Missing fields are None. Runs in the
+    enrichment process pool, so it must stay a picklable top-level function.
+    """
+
+    soup = BeautifulSoup(html, "html.parser")
+    posting = _job_posting_ld(soup) or {}
+
+    description = _text(posting["description"]) if posting.get("description") else None
+    location = _ld_location(posting) if posting else None
+    salary = _ld_salary(posting) if posting else None
+    posted = posting.get("datePosted")
+
+    if not description:
+        meta = soup.find("meta", attrs={"name": "description"}) or soup.find("meta", property="og:description")
+        main = soup.find("main") or soup.find("article") or soup.body
+        description = (main and " ".join(main.get_text(" ").split())) or (meta and meta.get("content")) or None
+    if not location:
+        node = soup.find(class_=re.compile(r"location", re.I))
+        if node is not None:
+            location = " ".join(node.get_text(" ").split())[:200] or None
+    if not salary and description:
+        match = _SALARY_RE.search(description)
+        salary = match.group(0).strip() if match else None
+    if not posted:
+        node = soup.find("meta", property="article:published_time") or soup.find("time", datetime=True)
+        posted = node and (node.get("content") or node.get("datetime"))
+
+    return {"location": location, "salary": salary, "posted_at": posted, "description": description}
+
+
+class PageEnricher:
+    """Fills in job details from the posting pages themselves.
+
+    Pages are fetched concurrently (PAGES_MAX_CONCURRENCY, default 8, and
+    PAGES_RATE_PER_SECOND) and parsed in a pool of ENRICH_PROCESSES worker
+    processes (default: CPU count, at most 4), since parsing HTML is CPU
+    bound. Results are cached in ``PageCache``: a cached page is reused
+    without a request for ENRICH_REVALIDATE_SECONDS (default 7 days), then
+    revalidated with its ETag / Last-Modified.
+    """
+
+    def __init__(self, cache: PageCache) -> None:
+        self.cache = cache
+        self.revalidate_after = float(os.getenv("ENRICH_REVALIDATE_SECONDS", str(7 * 24 * 3600)))
+        self.max_chars = int(os.getenv("ENRICH_DESCRIPTION_CHARS", "4000"))
+        self.counts: Dict[str, int] = {"fetched": 0, "not_modified": 0, "cached": 0, "failed": 0}
+        self._counts_lock = threading.Lock()
+        processes = int(os.getenv("ENRICH_PROCESSES", "0")) or min(os.cpu_count() or 1, 4)
+        # spawn: forking a process that is running scan threads can copy held locks.
+        self._parsers = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+        self._fetchers = ThreadPoolExecutor(
+            max_workers=provider_concurrency("pages"), thread_name_prefix="enrich"
+        )
+
+    def _count(self, result: str) -> None:
+        with self._counts_lock:
+            self.counts[result] += 1
+        metrics.inc("enrich_pages_total", result=result)
+
+    def _details(self, url: str) -> Optional[dict]:
+        cached = self.cache.get(url)
+        if cached is not None and time.time() - cached.fetched_at < self.revalidate_after:
+            self._count("cached")
+            return cached.details
+
+        headers = {"Accept": "text/html"}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        provider_bucket("pages").acquire()
+        with provider_slot("pages"), metrics.timer("provider_call", provider="pages"):
+            resp = transport.get(url, headers=headers, timeout=15, max_retries=1)
+
+        if resp.status_code == 304 and cached is not None:
+            self.cache.touch(url)
+            self._count("not_modified")
+            return cached.details
+        if resp.status_code >= 400 or "html" not in resp.headers.get("Content-Type", "html"):
+            self._count("failed")
+            return None
+
+        with metrics.timer("enrich_parse"):
+            details = self._parsers.submit(parse_job_page, resp.text).result()
+        self.cache.put(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), details)
+        self._count("fetched")
+        return details
+
+    def _safe_details(self, url: str) -> Optional[dict]:
+        try:
+            return self._details(url)
+        except Exception as exc:
+            logger.warning("Enriching %s failed: %s", url, exc)
+            self._count("failed")
+            return None
+
+    def _apply(self, job: JobPosting, details: dict, classifier: ClassifierEngine) -> None:
+        if details.get("location") and job.location in ("", "Unknown"):
+            job.location = details["location"]
+        if details.get("description") and len(details["description"]) > len(job.description_snippet):
+            job.description_snippet = details["description"][: self.max_chars]
+        job.salary = details.get("salary") or job.salary
+        job.posted_at = details.get("posted_at") or job.posted_at
+
+        # Re-classify now that the real location and description are known.
+        classification = classifier.classify(job)
+        job.location_type = classification.location_type
+        job.category = classification.category
+
+    def enrich(self, jobs: Iterable[JobPosting]) -> List[JobPosting]:
+        """Enrich ``jobs`` in place (those with a fetchable page); returns them."""
+
+        jobs = list(jobs)
+        classifier = get_classifier()
+        targets = [job for job in jobs if not _skipped(job.url)]
+        for job, details in zip(targets, self._fetchers.map(self._safe_details, [j.url for j in targets])):
+            if details:
+                self._apply(job, details, classifier)
+        return jobs
+
+    def close(self) -> None:
+        self._fetchers.shutdown()
+        self._parsers.shutdown()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+
+PREFIX = "geojob"
+
+_SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _series(name: str, labels: Dict[str, object]) -> _SeriesKey:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format(key: _SeriesKey) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class MetricsRegistry:
+    """Process-wide stage timings and counters.
+
+    Stages (provider calls, normalization, dedup, classification, webhook
+    sends, ...) record a call count, total seconds and the slowest call.
+    Counters cover things like HTTP retries and rate-limit waits. Values are
+    cumulative for the life of the process; use ``snapshot`` and ``delta``
+    to look at a single run.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stages: Dict[_SeriesKey, list] = {}
+        self._counters: Dict[_SeriesKey, float] = {}
+
+    def observe(self, stage: str, seconds: float, **labels) -> None:
+        key = _series(stage, labels)
+        with self._lock:
+            entry = self._stages.get(key)
+            if entry is None:
+                self._stages[key] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                if seconds > entry[2]:
+                    entry[2] = seconds
+
+    @contextmanager
+    def timer(self, stage: str, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, **labels)
+
+    def inc(self, name: str, amount: float = 1.0, **labels) -> None:
+        key = _series(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serialisable copy of every stage and counter."""
+
+        with self._lock:
+            return {
+                "stages": {
+                    _format(key): {"count": count, "seconds": total, "max": slowest}
+                    for key, (count, total, slowest) in self._stages.items()
+                },
+                "counters": {_format(key): value for key, value in self._counters.items()},
+            }
+
+    def delta(self, before: dict) -> dict:
+        """Snapshot of what changed since ``before`` (an earlier ``snapshot``).
+
+        ``max`` is omitted because it cannot be split per run.
+        """
+
+        now = self.snapshot()
+        stages = {}
+        for key, entry in now["stages"].items():
+            prior = before.get("stages", {}).get(key, {})
+            count = entry["count"] - prior.get("count", 0)
+            if count:
+                stages[key] = {"count": count, "seconds": entry["seconds"] - prior.get("seconds", 0.0)}
+        counters = {}
+        for key, value in now["counters"].items():
+            change = value - before.get("counters", {}).get(key, 0.0)
+            if change:
+                counters[key] = change
+        return {"stages": stages, "counters": counters}
+
+    def render_prometheus(self) -> str:
+        """Render the registry in the Prometheus text exposition format."""
+
+        with self._lock:
+            stages = sorted(self._stages.items())
+            counters = sorted(self._counters.items())
+
+        lines = [
+            f"# HELP {PREFIX}_stage_seconds Time spent per pipeline stage.",
+            f"# TYPE {PREFIX}_stage_seconds summary",
+        ]
+        for (stage, labels), (count, total, _) in stages:
+            key = (f"{PREFIX}_stage_seconds", (("stage", stage),) + labels)
+            lines.append(f"{_format((key[0] + '_count', key[1]))} {count}")
+            lines.append(f"{_format((key[0] + '_sum', key[1]))} {total:.6f}")
+        lines.append(f"# TYPE {PREFIX}_stage_seconds_max gauge")
+        for (stage, labels), (_, _, slowest) in stages:
+            lines.append(f"{_format((f'{PREFIX}_stage_seconds_max', (('stage', stage),) + labels))} {slowest:.6f}")
+
+        declared = set()
+        for (name, labels), value in counters:
+            if name not in declared:
+                lines.append(f"# TYPE {PREFIX}_{name} counter")
+                declared.add(name)
+            lines.append(f"{_format((f'{PREFIX}_{name}', labels))} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: Optional[str] = None) -> Optional[Path]:
+        """Write ``snapshot()`` to ``path`` (default METRICS_FILE); no-op if unset."""
+
+        path = path or os.getenv("METRICS_FILE")
+        if not path:
+            return None
+        target = Path(path)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_text(json.dumps(self.snapshot(), indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(target)
+        return target
+
+
+metrics = MetricsRegistry()
+
+
+def start_http_server(port: Optional[int] = None, host: str = "0.0.0.0") -> Optional[ThreadingHTTPServer]:
+    """Serve ``/metrics`` in Prometheus format from a daemon thread.
+
+    The port defaults to METRICS_PORT; nothing is started when it is unset.
+    """
+
+    if port is None:
+        if not os.getenv("METRICS_PORT"):
+            return None
+        port = int(os.environ["METRICS_PORT"])
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
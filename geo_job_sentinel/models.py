@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import json
+import sys
+import zlib
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 
 class LocationType(str, Enum):
@@ -13,7 +16,44 @@ class LocationType(str, Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+class RawPayload:
+    """Compressed provider payload with the fields we read kept eager.
+
+    Only ``date`` is read on the hot path (freshness), so it is stored as a
+    plain attribute. The rest of the provider JSON is kept as a
+    zlib-compressed blob and decoded on access.
+    """
+
+    __slots__ = ("date", "_blob")
+
+    def __init__(self, item: Dict[str, Any]) -> None:
+        date = item.get("date")
+        self.date: Optional[str] = str(date) if date is not None else None
+        self._blob = zlib.compress(json.dumps(item, separators=(",", ":"), default=str).encode("utf-8"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(self._blob))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "date":
+            return self.date if self.date is not None else default
+        return self.to_dict().get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.to_dict()[key]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RawPayload):
+            return self._blob == other._blob
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RawPayload({self.to_dict()!r})"
+
+
+@dataclass(slots=True)
 class JobPosting:
     id: str
     title: str
@@ -26,29 +66,40 @@ class JobPosting:
     is_new_company: bool = False
     location_type: LocationType = LocationType.UNKNOWN
     discovered_at: datetime = field(default_factory=datetime.utcnow)
-    raw_source: Optional[dict] = None
+    raw_source: Optional[Union[RawPayload, dict]] = None
+    # Filled in from the posting page by the optional enrichment stage.
+    salary: Optional[str] = None
+    posted_at: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        # Sources, companies and categories repeat across thousands of jobs.
+        self.source = sys.intern(self.source)
+        self.company = sys.intern(self.company)
+        self.category = sys.intern(self.category)
+        if isinstance(self.raw_source, dict):
+            self.raw_source = RawPayload(self.raw_source) if self.raw_source else None
 
-def classify_location_type(title: str, description: str, location: str) -> LocationType:
-    text = " ".join([title or "", description or "", location or ""]).lower()
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form, e.g. for the work queue; see ``from_dict``."""
 
-    remote_markers = ["remote", "work from home", "wfh", "anywhere", "distributed"]
-    hybrid_markers = ["hybrid", "flexible", "part-remote", "part time remote"]
-    onsite_markers = ["onsite", "on-site", "on site", "office-based"]
+        data = {name: getattr(self, name) for name in self.__dataclass_fields__}
+        data["location_type"] = self.location_type.value
+        data["discovered_at"] = self.discovered_at.isoformat()
+        data["raw_source"] = self.raw_source.to_dict() if isinstance(self.raw_source, RawPayload) else self.raw_source
+        return data
 
-    if any(m in text for m in remote_markers):
-        if any(m in text for m in hybrid_markers):
-            return LocationType.HYBRID
-        return LocationType.REMOTE
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobPosting":
+        data = dict(data)
+        data["location_type"] = LocationType(data.get("location_type", LocationType.UNKNOWN.value))
+        if data.get("discovered_at"):
+            data["discovered_at"] = datetime.fromisoformat(data["discovered_at"])
+        return cls(**data)
 
-    if any(m in text for m in hybrid_markers):
-        return LocationType.HYBRID
 
-    if any(m in text for m in onsite_markers):
-        return LocationType.ONSITE
+def classify_location_type(title: str, description: str, location: str) -> LocationType:
+    """Classify a posting as remote/hybrid/onsite; see ``classifier.ClassifierEngine``."""
 
-    # Heuristic: if there is a clear city/state but no remote markers, assume onsite
-    if "," in location and "remote" not in location.lower():
-        return LocationType.ONSITE
+    from .classifier import get_classifier
 
-    return LocationType.UNKNOWN
+    return get_classifier().location_type(title, description, location)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Sequence, Tuple
 
 
 def build_boolean_query(ats_domains: Iterable[str], title_keywords: List[str]) -> str:
@@ -14,3 +17,76 @@ def build_boolean_query(ats_domains: Iterable[str], title_keywords: List[str]) -
     titles_clause = " OR ".join(title_keywords)
 
     return f"({domains_clause}) AND ({titles_clause})"
+
+
+def _pack(items: Iterable[str], length: Callable[[List[str]], int], max_chars: int) -> List[List[str]]:
+    """Greedily group ``items`` so that ``length(group)`` stays within ``max_chars``.
+
+    An item that is too long on its own still gets a group of its own.
+    """
+
+    groups: List[List[str]] = []
+    group: List[str] = []
+    for item in items:
+        if group and length(group + [item]) > max_chars:
+            groups.append(group)
+            group = []
+        group.append(item)
+    if group:
+        groups.append(group)
+    return groups
+
+
+def pack_site_queries(base_clause: str, domains: Iterable[str], max_chars: int = 256) -> List[Tuple[str, List[str]]]:
+    """Pack ``site:`` filters for many domains into as few queries as fit ``max_chars``.
+
+    Returns ``(query, domains)`` pairs. A single domain keeps the plain
+    ``<base> site:domain`` form; several are OR-ed together:
+    "GIS" OR "Geospatial" (site:a.com OR site:b.com)
+    """
+
+    def render(batch: List[str]) -> str:
+        if len(batch) == 1:
+            return f"{base_clause} site:{batch[0]}"
+        return f"{base_clause} ({' OR '.join(f'site:{d}' for d in batch)})"
+
+    return [(render(batch), batch) for batch in _pack(domains, lambda b: len(render(b)), max_chars)]
+
+
+@dataclass(frozen=True)
+class QueryShard:
+    """One slice of the ATS domain × title keyword search space."""
+
+    domains: Tuple[str, ...]
+    keywords: Tuple[str, ...]
+
+    @property
+    def query(self) -> str:
+        return build_boolean_query(self.domains, list(self.keywords))
+
+    @property
+    def shard_id(self) -> str:
+        # Stable across runs and list reordering, so per-shard yield can be tracked.
+        raw = json.dumps([sorted(self.domains), sorted(self.keywords)])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def plan_query_shards(
+    ats_domains: Sequence[str], title_keywords: Sequence[str], max_chars: int = 300
+) -> List[QueryShard]:
+    """Split the domain × keyword space into queries no longer than ``max_chars``.
+
+    Keywords are grouped so their clause uses at most half the budget; each
+    keyword group is then paired with as many domains as fit the rest. Every
+    (domain, keyword) pair is covered by exactly one shard.
+    """
+
+    keyword_groups = _pack(title_keywords, lambda g: len(" OR ".join(g)), max_chars // 2)
+
+    shards: List[QueryShard] = []
+    for keywords in keyword_groups:
+        domain_groups = _pack(
+            ats_domains, lambda g: len(build_boolean_query(g, keywords)), max_chars
+        )
+        shards.extend(QueryShard(tuple(domains), tuple(keywords)) for domains in domain_groups)
+    return shards
@@ -2,42 +2,196 @@ from __future__ import annotations
 
 import logging
 import os
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
 
+from apscheduler.schedulers.base import BaseScheduler
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from .search.pipeline import run_gis_scan
-from .discord_integration.webhook import send_job_card, send_summary
+from . import adaptive
+from .config_loader import ScanProfile, load_config, scan_profiles
+from .metrics import metrics, start_http_server
+from .models import JobPosting
+from .search.pipeline import profile_source_names, stream_profile_scan
+from .storage.yield_stats import YieldStore
+from .discord_integration.delivery import DeliveryQueue
+from .discord_integration.webhook import send_summary
+from .workers import produce, work_queue_enabled
 
 
 logger = logging.getLogger("geo_job_sentinel.scheduler")
 
+# Profiles whose cron fired and that wait for the next coalesced run.
+_pending: set[str] = set()
+_pending_lock = threading.Lock()
+# Held while a run is in progress so runs never overlap.
+_run_lock = threading.Lock()
 
-def _scan_job() -> None:
-    logger.info("Starting scheduled GIS scan at %s", datetime.utcnow().isoformat())
-    jobs, stats = run_gis_scan()
-    for job in jobs:
-        send_job_card(job)
-    send_summary(jobs, stats)
-    logger.info("Completed scheduled scan: %s", stats)
+
+def _scan_and_deliver(
+    profiles: List[ScanProfile], stats: dict, only: Optional[Iterable[str]] = None
+) -> Dict[str, List[JobPosting]]:
+    found: Dict[str, List[JobPosting]] = {profile.name: [] for profile in profiles}
+    queues: Dict[str, DeliveryQueue] = {}
+
+    try:
+        for profile, batch in stream_profile_scan(profiles, stats, only=only):
+            found[profile.name].extend(batch)
+            queue = queues.get(profile.channel)
+            if queue is None:
+                queue = DeliveryQueue.from_config(profile.webhook_url, profile.channel).start()
+                queues[profile.channel] = queue
+            queue.submit(batch)
+    finally:
+        for channel, queue in queues.items():
+            report = queue.flush()
+            queue.stop()
+            queue.outbox.close()
+            logger.info(
+                "Delivered %d jobs in %d messages to channel %r (%d pending)",
+                report.sent,
+                report.messages,
+                channel or "default",
+                report.pending,
+            )
+    return found
+
+
+def _scan_profiles(profiles: List[ScanProfile], only: Optional[List[str]] = None) -> None:
+    """Scan ``profiles`` (limited to the ``only`` sources, if given) and report.
+
+    Each source's yield is recorded for the adaptive scheduler, whichever
+    mode is running.
+    """
+
+    logger.info(
+        "Starting scan for profiles %s at %s%s",
+        ", ".join(p.name for p in profiles),
+        datetime.utcnow().isoformat(),
+        f" (sources: {', '.join(only)})" if only is not None else "",
+    )
+    before = metrics.snapshot()
+    stats: dict = {}
+    if work_queue_enabled():
+        # Workers (scripts/run_worker.py) enrich, index and deliver.
+        found = produce(profiles, stats, only=only)
+        logger.info("Queued %d jobs for the workers", stats["queued"])
+    else:
+        found = _scan_and_deliver(profiles, stats, only=only)
+
+    store = YieldStore(load_config().database_url)
+    try:
+        intervals = adaptive.record_run(store, stats.get("per_source", {}))
+    finally:
+        store.close()
+    for name, interval in intervals.items():
+        logger.info("Source %s: next run in %.1fh", name, interval / 3600)
+
+    stats["metrics"] = metrics.delta(before)
+    metrics.write_json()
+    for profile in profiles:
+        jobs = found[profile.name]
+        if profile.name not in stats.get("profiles", ()):
+            continue
+        # Adaptive runs are frequent; only report the ones that found something.
+        if only is not None and not jobs:
+            continue
+        send_summary(jobs, {**stats, "new_jobs": len(jobs), "profile": profile.name}, profile.webhook_url)
+    logger.info("Completed scan: %s", stats)
+
+
+def _run_pending_profiles() -> None:
+    with _run_lock:
+        with _pending_lock:
+            names = set(_pending)
+            _pending.clear()
+        profiles = [profile for profile in scan_profiles() if profile.name in names]
+        if profiles:
+            _scan_profiles(profiles)
+
+
+def _request_profile_run(scheduler: BaseScheduler, name: str) -> None:
+    """Cron callback: queue ``name`` for the next coalesced run.
+
+    The first request opens a PROFILE_COALESCE_SECONDS window (default 60);
+    every profile that fires within it, or while a run is still going,
+    joins the same run, so shared sources are only queried once.
+    """
+
+    with _pending_lock:
+        first = not _pending
+        _pending.add(name)
+    if first:
+        window = float(os.getenv("PROFILE_COALESCE_SECONDS", "60"))
+        scheduler.add_job(
+            _run_pending_profiles,
+            "date",
+            run_date=datetime.now(timezone.utc) + timedelta(seconds=window),
+            misfire_grace_time=None,
+        )
+
+
+def _adaptive_tick() -> None:
+    """Interval job: run whichever sources ``adaptive.plan_run`` picks."""
+
+    if not _run_lock.acquire(blocking=False):
+        return  # the previous run is still going; try again next tick
+    try:
+        profiles = scan_profiles()
+        store = YieldStore(load_config().database_url)
+        try:
+            chosen = adaptive.plan_run(store, profile_source_names(profiles))
+        finally:
+            store.close()
+        if chosen:
+            _scan_profiles(profiles, only=chosen)
+    finally:
+        _run_lock.release()
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
     scheduler = BlockingScheduler(timezone="UTC")
 
-    # Daily summary hour (UTC)
-    hour_utc = int(os.getenv("DAILY_SUMMARY_HOUR_UTC", "18"))
+    # Prometheus endpoint on METRICS_PORT, if set.
+    if start_http_server() is not None:
+        logger.info("Serving metrics on :%s/metrics", os.environ["METRICS_PORT"])
 
-    scheduler.add_job(
-        _scan_job,
-        CronTrigger(hour=hour_utc, minute=0),
-        id="daily_gis_scan",
-        replace_existing=True,
-    )
+    if adaptive.adaptive_enabled():
+        # Sources run on their own yield-driven intervals within the daily
+        # API budget; profile schedules are ignored.
+        tick = float(os.getenv("ADAPTIVE_TICK_MINUTES", "15"))
+        scheduler.add_job(
+            _adaptive_tick,
+            "interval",
+            minutes=tick,
+            next_run_time=datetime.now(timezone.utc),
+            id="adaptive",
+            max_instances=1,
+            coalesce=True,
+        )
+        logger.info("Adaptive scheduling every %g minutes", tick)
+    else:
+        # One cron per profile in base_queries.json (default: daily at
+        # DAILY_SUMMARY_HOUR_UTC, ATS sources, default webhook).
+        for profile in scan_profiles():
+            scheduler.add_job(
+                _request_profile_run,
+                CronTrigger.from_crontab(profile.schedule, timezone="UTC"),
+                args=[scheduler, profile.name],
+                id=f"profile:{profile.name}",
+                replace_existing=True,
+            )
+            logger.info(
+                "Profile %s scheduled at '%s' UTC (sources: %s)",
+                profile.name,
+                profile.schedule,
+                ", ".join(profile.sources),
+            )
 
-    logger.info("Scheduler started. Daily GIS scan at %02d:00 UTC", hour_utc)
+    logger.info("Scheduler started")
     scheduler.start()
 
 
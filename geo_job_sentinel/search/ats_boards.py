@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import hashlib
+import html
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .. import transport
+from ..metrics import metrics
+from ..storage.feed_state import FeedState, FeedStateStore
+from ..storage.seen_jobs import SeenJobStore
+from ..urls import _root_domain
+from .limits import provider_bucket, provider_slot
+
+
+class Board(NamedTuple):
+    root: str  # ATS root domain, e.g. "greenhouse.io"
+    token: str  # company's board token / account name
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _plain(text: Optional[str], limit: int = 400) -> str:
+    text = _TAG_RE.sub(" ", html.unescape(text or ""))
+    return " ".join(text.split())[:limit]
+
+
+def _greenhouse(token: str, data: dict) -> List[dict]:
+    # boards-api.greenhouse.io/v1/boards/<token>/jobs?content=true
+    return [
+        {
+            "title": job.get("title"),
+            "link": f"https://boards.greenhouse.io/{token}/jobs/{job['id']}",
+            "snippet": _plain(job.get("content")),
+            "location": (job.get("location") or {}).get("name"),
+            "company": data.get("company_name") or token,
+            "date": job.get("updated_at"),
+        }
+        for job in data.get("jobs", [])
+        if job.get("id")
+    ]
+
+
+def _lever(token: str, data: list) -> List[dict]:
+    # api.lever.co/v0/postings/<company>?mode=json
+    return [
+        {
+            "title": job.get("text"),
+            "link": f"https://jobs.lever.co/{token}/{job['id']}",
+            "snippet": _plain(job.get("descriptionPlain") or job.get("description")),
+            "location": (job.get("categories") or {}).get("location"),
+            "company": token,
+            "date": job.get("createdAt"),
+        }
+        for job in data
+        if job.get("id")
+    ]
+
+
+def _workable(token: str, data: dict) -> List[dict]:
+    # apply.workable.com/api/v1/widget/accounts/<account>
+    items = []
+    for job in data.get("jobs", []):
+        if not job.get("shortcode"):
+            continue
+        place = ", ".join(p for p in (job.get("city"), job.get("state"), job.get("country")) if p)
+        items.append(
+            {
+                "title": job.get("title"),
+                "link": f"https://apply.workable.com/{token}/j/{job['shortcode']}",
+                "snippet": _plain(job.get("description")),
+                "location": ("Remote" if job.get("telecommuting") else place) or None,
+                "company": data.get("name") or token,
+                "date": job.get("published_on"),
+            }
+        )
+    return items
+
+
+def _smartrecruiters(token: str, data: dict) -> List[dict]:
+    # api.smartrecruiters.com/v1/companies/<company>/postings (first 100)
+    items = []
+    for job in data.get("content", []):
+        if not job.get("id"):
+            continue
+        location = job.get("location") or {}
+        place = ", ".join(p for p in (location.get("city"), location.get("region"), location.get("country")) if p)
+        items.append(
+            {
+                "title": job.get("name"),
+                "link": f"https://jobs.smartrecruiters.com/{token}/{job['id']}",
+                "snippet": "",
+                "location": ("Remote" if location.get("remote") else place) or None,
+                "company": (job.get("company") or {}).get("name") or token,
+                "date": job.get("releasedDate"),
+            }
+        )
+    return items
+
+
+# Public board feeds keyed by ATS root domain: (feed URL template, parser).
+BOARD_FEEDS: Dict[str, Tuple[str, Callable[[str, object], List[dict]]]] = {
+    "greenhouse.io": ("https://boards-api.greenhouse.io/v1/boards/{token}/jobs?content=true", _greenhouse),
+    "lever.co": ("https://api.lever.co/v0/postings/{token}?mode=json", _lever),
+    "workable.com": ("https://apply.workable.com/api/v1/widget/accounts/{token}", _workable),
+    "smartrecruiters.com": ("https://api.smartrecruiters.com/v1/companies/{token}/postings?limit=100", _smartrecruiters),
+}
+
+# Prefix of canonical posting URLs (see urls.ATS_URL_RULES); the next path
+# segment is the board token.
+_POSTING_URL_PREFIXES = {
+    "greenhouse.io": "https://boards.greenhouse.io/",
+    "lever.co": "https://jobs.lever.co/",
+    "workable.com": "https://apply.workable.com/",
+    "smartrecruiters.com": "https://jobs.smartrecruiters.com/",
+}
+
+
+def _enabled_roots(ats_domains: Iterable[str]) -> set[str]:
+    return {_root_domain(domain.strip().lower()) for domain in ats_domains} & set(BOARD_FEEDS)
+
+
+def configured_boards(ats_boards: Dict[str, Iterable[str]], ats_domains: Iterable[str]) -> List[Board]:
+    """Boards from config/ats_boards.json whose domain is an enabled ATS with a feed."""
+
+    enabled = _enabled_roots(ats_domains)
+    boards = []
+    for domain, tokens in ats_boards.items():
+        root = _root_domain(domain.strip().lower())
+        if root in enabled:
+            boards.extend(Board(root, token.strip()) for token in tokens if token.strip())
+    return boards
+
+
+def discovered_boards(store: SeenJobStore, ats_domains: Iterable[str]) -> List[Board]:
+    """Boards of enabled ATSs that appear in previously seen posting URLs."""
+
+    found = []
+    for root in sorted(_enabled_roots(ats_domains)):
+        prefix = _POSTING_URL_PREFIXES[root]
+        for key in store.keys_with_prefix(prefix):
+            token = key[len(prefix) :].split("/", 1)[0]
+            if token:
+                found.append(Board(root, token))
+    return list(dict.fromkeys(found))
+
+
+class AtsBoardClient:
+    """Conditional fetcher for public ATS board feeds.
+
+    Sends the ETag / Last-Modified recorded in ``state`` with each request,
+    so an unchanged board costs one 304 (or, for servers without
+    validators, a body-hash comparison) and no parsing: its postings are
+    the ones stored when it last changed.
+    """
+
+    def __init__(self, state: FeedStateStore) -> None:
+        self.state = state
+
+    def feed_url(self, board: Board) -> str:
+        return BOARD_FEEDS[board.root][0].format(token=board.token)
+
+    def fetch(self, board: Board) -> Tuple[List[dict], bool]:
+        """Return the board's postings and whether the feed changed since the last poll.
+
+        Postings are returned either way: whether one is relevant depends on
+        the caller's keywords, and whether it was reported on the seen-jobs
+        store, neither of which the feed state knows about.
+        """
+
+        url = self.feed_url(board)
+        previous = self.state.get(url)
+        headers = {"Accept": "application/json"}
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        provider_bucket("ats_boards").acquire()
+        with provider_slot("ats_boards"), metrics.timer("provider_call", provider="ats_boards"):
+            resp = transport.get(url, headers=headers, timeout=30)
+
+        if resp.status_code == 304 and previous is not None:
+            self.state.touch(url)
+            return previous.items, False
+        if resp.status_code >= 400:
+            raise RuntimeError(f"Board feed {url} returned {resp.status_code}")
+
+        body_hash = hashlib.sha1(resp.content).hexdigest()
+        if previous is not None and previous.body_hash == body_hash:
+            self.state.touch(url)
+            return previous.items, False
+
+        items = BOARD_FEEDS[board.root][1](board.token, resp.json())
+        state = FeedState(resp.headers.get("ETag"), resp.headers.get("Last-Modified"), body_hash, items)
+        self.state.set(url, state)
+        return items, True
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict
+
+from ..metrics import metrics
+
+
+# Default number of in-flight requests allowed per provider. Override with
+# e.g. SERPER_MAX_CONCURRENCY=8 or TWITTER_MAX_CONCURRENCY=2.
+DEFAULT_PROVIDER_CONCURRENCY = {
+    "serper": 4,
+    "twitter": 1,
+    "ats_boards": 8,
+    "pages": 8,
+}
+
+_slots: Dict[str, threading.BoundedSemaphore] = {}
+_slots_lock = threading.Lock()
+
+
+def provider_concurrency(provider: str) -> int:
+    default = DEFAULT_PROVIDER_CONCURRENCY.get(provider, 2)
+    value = int(os.getenv(f"{provider.upper()}_MAX_CONCURRENCY", str(default)))
+    return max(value, 1)
+
+
+def provider_slot(provider: str) -> threading.BoundedSemaphore:
+    """Return the process-wide semaphore capping concurrent calls to a provider.
+
+    Use it as a context manager around each outbound request so that running
+    several scans in parallel never exceeds the provider's concurrency limit.
+    """
+
+    with _slots_lock:
+        slot = _slots.get(provider)
+        if slot is None:
+            slot = threading.BoundedSemaphore(provider_concurrency(provider))
+            _slots[provider] = slot
+        return slot
+
+
+# Default sustained request rate (requests/second) per provider. Override with
+# e.g. SERPER_RATE_PER_SECOND=10; burst size via SERPER_RATE_BURST.
+DEFAULT_PROVIDER_RATE = {
+    "serper": 5.0,
+    "twitter": 0.5,
+    "ats_boards": 10.0,
+    "pages": 20.0,
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens/second up to ``capacity``.
+
+    Time spent waiting is counted in ``metrics`` under ``name``.
+    """
+
+    def __init__(self, rate: float, capacity: float, name: str = "") -> None:
+        self.name = name
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available; return the seconds waited."""
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    break
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+        if waited:
+            metrics.inc("rate_limit_wait_seconds_total", waited, limiter=self.name)
+        return waited
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def provider_bucket(provider: str) -> TokenBucket:
+    with _buckets_lock:
+        bucket = _buckets.get(provider)
+        if bucket is None:
+            default = DEFAULT_PROVIDER_RATE.get(provider, 1.0)
+            rate = float(os.getenv(f"{provider.upper()}_RATE_PER_SECOND", str(default)))
+            burst = float(os.getenv(f"{provider.upper()}_RATE_BURST", str(max(rate, 1.0))))
+            bucket = TokenBucket(rate=max(rate, 0.01), capacity=burst, name=provider)
+            _buckets[provider] = bucket
+        return bucket
@@ -1,16 +1,90 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import math
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Iterable, List, Tuple
-
-from ..config_loader import load_config
-from ..models import JobPosting, classify_location_type
-from ..query_builder import build_boolean_query
-from .serper_client import SerperClient
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..config_loader import DEFAULT_PROFILE, ScanProfile, load_config
+from ..dedup import JobDeduplicator
+from ..enrichment import PageEnricher, enrichment_enabled
+from ..metrics import metrics
+from ..classifier import ClassifierEngine, get_classifier
+from ..models import JobPosting
+from ..query_builder import pack_site_queries, plan_query_shards
+from ..storage.feed_state import FeedStateStore
+from ..storage.job_index import JobIndex
+from ..storage.page_cache import PageCache
+from ..storage.response_cache import get_response_cache
+from ..storage.seen_jobs import SeenJobStore, job_key
+from ..storage.watermarks import WatermarkStore, incremental_enabled
+from ..storage.yield_stats import YieldStore
+from .ats_boards import AtsBoardClient, Board, configured_boards, discovered_boards
+from .serper_client import SerperClient, time_filter_since
 from .twitter_client import TwitterClient
 
 
-def normalize_result(item: dict, source: str, is_new_company: bool = False) -> JobPosting:
+logger = logging.getLogger("geo_job_sentinel.pipeline")
+
+ScanResult = Tuple[List[JobPosting], dict]
+# Receives each batch of jobs a scan finds, as soon as it has them.
+JobSink = Callable[[List[JobPosting]], None]
+# (scope, key, last_run_at, last_id) a source reports in its stats under
+# "watermarks"; stored by ``_stream_sources`` only once the source finished.
+PendingMark = Tuple[str, str, float, Optional[str]]
+
+
+def _time_filter(marks: WatermarkStore, scope: str, key: str) -> Optional[str]:
+    """Serper ``tbs`` covering results since the last successful run of this query."""
+
+    if not incremental_enabled():
+        return None
+    mark = marks.get(scope, key)
+    return time_filter_since(mark.last_run_at if mark else None)
+
+
+def _oldest_time_filter(marks: WatermarkStore, scope: str, keys: List[str]) -> Optional[str]:
+    """Serper ``tbs`` covering the last successful run of every key.
+
+    Used for packed queries, whose text changes whenever one of their keys is
+    skipped: the oldest mark wins, and a key that never ran means a full search.
+    """
+
+    if not incremental_enabled():
+        return None
+    last_runs = []
+    for key in keys:
+        mark = marks.get(scope, key)
+        if mark is None:
+            return None
+        last_runs.append(mark.last_run_at)
+    return time_filter_since(min(last_runs))
+
+
+def _query_key(query: str) -> str:
+    return hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+
+
+def _cache_stats(client) -> dict:
+    return {"hits": client.cache_hits, "misses": client.cache_misses}
+
+
+def normalize_result(
+    item: dict, source: str, is_new_company: bool = False, classifier: Optional[ClassifierEngine] = None
+) -> JobPosting:
+    """Turn a provider result into a classified ``JobPosting``.
+
+    Scans pass the ``classifier`` they resolved once up front; looking it up
+    per job would re-check the config files for every result.
+    """
+
     title = item.get("title") or "Unknown title"
     snippet = item.get("snippet") or ""
     url = item.get("link") or item.get("url") or ""
@@ -18,55 +92,244 @@ def normalize_result(item: dict, source: str, is_new_company: bool = False) -> J
     company = item.get("source") or item.get("company") or "Unknown Company"
     location = item.get("location") or item.get("city") or "Unknown"
 
-    location_type = classify_location_type(title, snippet, location)
-
-    return JobPosting(
-        id=url or f"{title}-{datetime.utcnow().isoformat()}",
-        title=title,
-        company=company,
-        location=location,
-        source=source,
-        url=url,
-        description_snippet=snippet,
-        is_new_company=is_new_company,
-        location_type=location_type,
-        raw_source=item,
-    )
+    with metrics.timer("normalize", source=source):
+        job = JobPosting(
+            id=url or f"{title}-{datetime.utcnow().isoformat()}",
+            title=title,
+            company=company,
+            location=location,
+            source=source,
+            url=url,
+            description_snippet=snippet,
+            is_new_company=is_new_company,
+            raw_source=item,
+        )
+
+    with metrics.timer("classify"):
+        classification = (classifier or get_classifier()).classify(job)
+    job.location_type = classification.location_type
+    job.category = classification.category
+    return job
+
 
+def _fetch_pages(
+    client: SerperClient,
+    query: str,
+    tbs: Optional[str],
+    usage: Dict[str, int],
+    max_pages: Optional[int] = None,
+) -> List[List[dict]]:
+    """All result pages for ``query``; requests sent are counted in ``usage``, even if one fails."""
 
-def run_gis_scan() -> Tuple[List[JobPosting], dict]:
-    """Run a GIS-focused scan across configured ATS domains only."""
+    return list(client.iter_pages(query, max_pages=max_pages, tbs=tbs, usage=usage))
+
+
+def run_gis_scan(on_jobs: Optional[JobSink] = None, profile: str = DEFAULT_PROFILE) -> ScanResult:
+    """Run a GIS-focused scan across configured ATS domains only.
+
+    Title keywords come from ``profile`` in base_queries.json.
+
+    The domain × keyword space is split into shards that fit
+    ATS_QUERY_MAX_CHARS (default 300), run on ATS_SHARD_WORKERS threads
+    (default 4). Each shard's yield of jobs not seen by earlier runs is
+    recorded, and shards that keep coming back empty are run less often.
+    Shards only ask for results newer than their last successful run.
+    """
 
     cfg = load_config()
-    query_cfg = cfg.base_queries.get("gis_default", {})
+    classifier = get_classifier(cfg)
+    query_cfg = cfg.base_queries.get(profile, {})
     title_keywords: Iterable[str] = query_cfg.get("title_keywords", [])
 
-    boolean_query = build_boolean_query(cfg.ats_domains, list(title_keywords))
-
-    client = SerperClient(api_key=cfg.serper_api_key)
-    raw_results = client.search_jobs(boolean_query, num=10)
+    max_chars = int(os.getenv("ATS_QUERY_MAX_CHARS", "300"))
+    shards = plan_query_shards(cfg.ats_domains, list(title_keywords), max_chars=max_chars)
 
     jobs: List[JobPosting] = []
     seen_ids: set[str] = set()
-
-    for item in raw_results:
-        job = normalize_result(item, source="Serper/Google")
-        if job.id in seen_ids:
-            continue
-        seen_ids.add(job.id)
-        jobs.append(job)
+    by_shard: Dict[str, dict] = {}
+    total_scanned = 0
+    pages_fetched = 0
+    failed_shards = 0
+    watermarks: List[PendingMark] = []
+
+    scan_started = time.time()
+    yield_store = YieldStore(cfg.database_url)
+    seen_store = SeenJobStore(cfg.database_url)
+    marks = WatermarkStore(cfg.database_url)
+    try:
+        due = [shard for shard in shards if yield_store.is_due("ats_shard", shard.shard_id)]
+        for shard in shards:
+            if shard not in due:
+                yield_store.record_skip("ats_shard", shard.shard_id)
+
+        client = SerperClient(api_key=cfg.serper_api_key, cache=get_response_cache())
+        workers = max(1, min(int(os.getenv("ATS_SHARD_WORKERS", "4")), len(due) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ats-shard") as executor:
+            futures = {}
+            for shard in due:
+                usage = {"api_calls": 0}
+                tbs = _time_filter(marks, "ats_shard", shard.shard_id)
+                futures[executor.submit(_fetch_pages, client, shard.query, tbs, usage)] = (shard, usage)
+            # Handle shards as they finish so their jobs can be streamed out early.
+            for future in as_completed(futures):
+                shard, usage = futures[future]
+                try:
+                    pages = future.result()
+                except Exception as exc:
+                    # One failing shard must not cost the others their results and marks.
+                    logger.warning("ATS shard %s failed: %s", shard.shard_id, exc)
+                    failed_shards += 1
+                    yield_store.record_run(
+                        "ats_shard",
+                        shard.shard_id,
+                        api_calls=usage["api_calls"],
+                        results=0,
+                        new_jobs=0,
+                        label=shard.query,
+                    )
+                    by_shard[shard.shard_id] = {"results": 0, "new_jobs": 0, "failed": True}
+                    continue
+                jobs_in_shard = [
+                    normalize_result(item, source="Serper/Google", classifier=classifier)
+                    for page in pages
+                    for item in page
+                ]
+                previously_seen = seen_store.seen_keys(job_key(job) for job in jobs_in_shard)
+                total_scanned += len(jobs_in_shard)
+                pages_fetched += len(pages)
+
+                fresh: List[JobPosting] = []
+                shard_new = 0
+                for job in jobs_in_shard:
+                    if job.id in seen_ids:
+                        continue
+                    seen_ids.add(job.id)
+                    fresh.append(job)
+                    if job_key(job) not in previously_seen:
+                        shard_new += 1
+                jobs.extend(fresh)
+                if on_jobs is not None and fresh:
+                    on_jobs(fresh)
+
+                yield_store.record_run(
+                    "ats_shard",
+                    shard.shard_id,
+                    # Empty pages were requests too.
+                    api_calls=usage["api_calls"],
+                    results=len(jobs_in_shard),
+                    new_jobs=shard_new,
+                    label=shard.query,
+                )
+                watermarks.append(("ats_shard", shard.shard_id, scan_started, None))
+                by_shard[shard.shard_id] = {"results": len(jobs_in_shard), "new_jobs": shard_new}
+    finally:
+        yield_store.close()
+        seen_store.close()
+        marks.close()
 
     stats = {
         "new_jobs": len(jobs),
-        "total_scanned": len(raw_results),
-        "duplicates_filtered": len(raw_results) - len(jobs),
+        "total_scanned": total_scanned,
+        "duplicates_filtered": total_scanned - len(jobs),
         "by_source": {"Serper/Google": len(jobs)},
+        "pages_fetched": pages_fetched,
+        "shards_planned": len(shards),
+        "shards_run": len(due),
+        "shards_failed": failed_shards,
+        "by_shard": by_shard,
+        "api_calls": client.api_calls,
+        "watermarks": watermarks,
+        "cache": _cache_stats(client),
     }
 
     return jobs, stats
 
 
-def run_discovery_scan() -> Tuple[List[JobPosting], dict]:
+def _board_discovery_enabled() -> bool:
+    return os.getenv("ATS_BOARD_DISCOVERY", "1") not in ("0", "false", "no")
+
+
+def run_ats_board_scan(on_jobs: Optional[JobSink] = None, profile: str = DEFAULT_PROFILE) -> ScanResult:
+    """Poll public ATS board feeds (Greenhouse, Lever, Workable, SmartRecruiters).
+
+    Boards come from config/ats_boards.json, keyed by ATS domain, plus (with
+    ATS_BOARD_DISCOVERY, default on) every board token seen in earlier
+    results. Feeds are fetched on ATS_BOARD_WORKERS threads (default 8)
+    with conditional requests, so unchanged boards cost a 304 and reuse
+    their stored postings. Postings are kept when their title contains one
+    of ``profile``'s title keywords; those reported before are dropped later
+    by the seen-jobs store.
+    """
+
+    cfg = load_config()
+    classifier = get_classifier(cfg)
+    boards: List[Board] = configured_boards(cfg.ats_boards, cfg.ats_domains)
+    if _board_discovery_enabled():
+        seen_store = SeenJobStore(cfg.database_url)
+        try:
+            boards = list(dict.fromkeys(boards + discovered_boards(seen_store, cfg.ats_domains)))
+        finally:
+            seen_store.close()
+
+    keywords = [k.strip('"').lower() for k in cfg.base_queries.get(profile, {}).get("title_keywords", [])]
+
+    def relevant(item: dict) -> bool:
+        title = (item.get("title") or "").lower()
+        return not keywords or any(keyword in title for keyword in keywords)
+
+    jobs: List[JobPosting] = []
+    seen_ids: set[str] = set()
+    total_scanned = 0
+    irrelevant = 0
+    unchanged = 0
+    failed = 0
+
+    state = FeedStateStore(cfg.database_url)
+    client = AtsBoardClient(state)
+    try:
+        workers = max(int(os.getenv("ATS_BOARD_WORKERS", "8")), 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ats-board") as executor:
+            futures = {executor.submit(client.fetch, board): board for board in boards}
+            for future in as_completed(futures):
+                board = futures[future]
+                try:
+                    items, changed = future.result()
+                except Exception as exc:
+                    logger.warning("Board %s/%s failed: %s", board.root, board.token, exc)
+                    failed += 1
+                    continue
+                unchanged += not changed
+
+                total_scanned += len(items)
+                fresh: List[JobPosting] = []
+                for item in items:
+                    if not relevant(item):
+                        irrelevant += 1
+                        continue
+                    job = normalize_result(item, source="ATS/Board", classifier=classifier)
+                    if job.id in seen_ids:
+                        continue
+                    seen_ids.add(job.id)
+                    fresh.append(job)
+                jobs.extend(fresh)
+                if on_jobs is not None and fresh:
+                    on_jobs(fresh)
+    finally:
+        state.close()
+
+    stats = {
+        "new_jobs": len(jobs),
+        "total_scanned": total_scanned,
+        "irrelevant": irrelevant,
+        "duplicates_filtered": total_scanned - irrelevant - len(jobs),
+        "by_source": {"ATS/Board": len(jobs)},
+        "boards": {"polled": len(boards), "unchanged": unchanged, "failed": failed},
+    }
+
+    return jobs, stats
+
+
+def run_discovery_scan(on_jobs: Optional[JobSink] = None) -> ScanResult:
     """Broader "discovery" scan to surface new / unknown companies.
 
     This intentionally does *not* restrict to ATS domains; it searches the
@@ -74,182 +337,628 @@ def run_discovery_scan() -> Tuple[List[JobPosting], dict]:
     """
 
     cfg = load_config()
+    classifier = get_classifier(cfg)
 
     discovery_query = (
         '"GIS" OR "Geospatial" OR "Remote Sensing" OR "spatial data" '
         '"we are hiring" OR "we\'re hiring" OR "careers" OR "join our team"'
     )
 
-    client = SerperClient(api_key=cfg.serper_api_key)
-    raw_results = client.search_jobs(discovery_query, num=10)
+    client = SerperClient(api_key=cfg.serper_api_key, cache=get_response_cache())
 
     jobs: List[JobPosting] = []
     seen_ids: set[str] = set()
-
-    for item in raw_results:
-        job = normalize_result(item, source="Discovery/Serper", is_new_company=True)
-        if job.id in seen_ids:
-            continue
-        seen_ids.add(job.id)
-        jobs.append(job)
+    total_scanned = 0
+    pages_fetched = 0
+
+    scan_started = time.time()
+    marks = WatermarkStore(cfg.database_url)
+    try:
+        tbs = _time_filter(marks, "discovery", _query_key(discovery_query))
+        for page in client.iter_pages(discovery_query, tbs=tbs):
+            pages_fetched += 1
+            total_scanned += len(page)
+            fresh: List[JobPosting] = []
+            for item in page:
+                job = normalize_result(
+                    item, source="Discovery/Serper", is_new_company=True, classifier=classifier
+                )
+                if job.id in seen_ids:
+                    continue
+                seen_ids.add(job.id)
+                fresh.append(job)
+            jobs.extend(fresh)
+            if on_jobs is not None and fresh:
+                on_jobs(fresh)
+    finally:
+        marks.close()
 
     stats = {
         "new_jobs": len(jobs),
-        "total_scanned": len(raw_results),
-        "duplicates_filtered": len(raw_results) - len(jobs),
+        "total_scanned": total_scanned,
+        "duplicates_filtered": total_scanned - len(jobs),
         "by_source": {"Discovery/Serper": len(jobs)},
+        "pages_fetched": pages_fetched,
+        "api_calls": client.api_calls,
+        "watermarks": [("discovery", _query_key(discovery_query), scan_started, None)],
+        "cache": _cache_stats(client),
     }
 
     return jobs, stats
 
 
-def run_company_seed_scan() -> Tuple[List[JobPosting], dict]:
+SEED_KEYWORD_CLAUSE = '"GIS" OR "Geospatial" OR "Remote Sensing" OR "spatial"'
+
+
+def _match_seed_domain(url: str, domains: List[str]) -> str | None:
+    host = (urlsplit(url).hostname or "").lower()
+    for domain in domains:
+        domain = domain.lower()
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return None
+
+
+def _scan_seed_batch(
+    client: SerperClient, query: str, domains: List[str], tbs: Optional[str], usage: Dict[str, int]
+) -> Tuple[List[List[dict]], float]:
+    started = time.monotonic()
+    # Keep the old 5-results-per-domain budget: a batch of 9 domains may
+    # page up to 45 results instead of sharing a single page of 10.
+    max_pages = math.ceil(5 * len(domains) / 10)
+    pages = _fetch_pages(client, query, tbs, usage, max_pages=max_pages)
+    return pages, time.monotonic() - started
+
+
+def run_company_seed_scan(on_jobs: Optional[JobSink] = None) -> ScanResult:
     """Scan specific company domains seeded from config/company_seeds.json.
 
     This lets you feed in domains from startup lists, GIS communities, etc.
+    Domains are packed into OR-ed ``site:`` queries (SEED_QUERY_MAX_CHARS,
+    default 256) and the batches run on a small worker pool
+    (SEED_SCAN_WORKERS, default 4), throttled by the Serper rate limiter.
+    Like ATS shards, domains whose results stop including new jobs are
+    left out of more and more runs.
     """
 
     cfg = load_config()
-    if not cfg.company_seeds:
+    classifier = get_classifier(cfg)
+    yield_store = YieldStore(cfg.database_url)
+    domains = []
+    for domain in dict.fromkeys(d.strip() for d in cfg.company_seeds if d and d.strip()):
+        if yield_store.is_due("seed_domain", domain):
+            domains.append(domain)
+        else:
+            yield_store.record_skip("seed_domain", domain)
+    if not domains:
+        yield_store.close()
         return [], {"new_jobs": 0, "total_scanned": 0, "duplicates_filtered": 0, "by_source": {}}
 
-    client = SerperClient(api_key=cfg.serper_api_key)
+    client = SerperClient(api_key=cfg.serper_api_key, cache=get_response_cache())
+
+    max_chars = int(os.getenv("SEED_QUERY_MAX_CHARS", "256"))
+    batches = pack_site_queries(SEED_KEYWORD_CLAUSE, domains, max_chars=max_chars)
+    workers = max(1, min(int(os.getenv("SEED_SCAN_WORKERS", "4")), len(batches)))
 
     jobs: List[JobPosting] = []
     seen_ids: set[str] = set()
     total_scanned = 0
-
-    for domain in cfg.company_seeds:
-        domain = domain.strip()
-        if not domain:
-            continue
-
-        query = (
-            f'"GIS" OR "Geospatial" OR "Remote Sensing" OR "spatial" '
-            f'site:{domain}'
-        )
-
-        raw_results = client.search_jobs(query, num=5)
-        total_scanned += len(raw_results)
-
-        for item in raw_results:
-            job = normalize_result(
-                item,
-                source="Discovery/SeedCompanies",
-                is_new_company=True,
-            )
-            if job.id in seen_ids:
-                continue
-            seen_ids.add(job.id)
-            jobs.append(job)
+    pages_fetched = 0
+    failed_batches = 0
+    by_domain: Dict[str, dict] = {}
+    watermarks: List[PendingMark] = []
+
+    scan_started = time.time()
+    marks = WatermarkStore(cfg.database_url)
+    seen_store = SeenJobStore(cfg.database_url)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="seed-scan") as executor:
+            futures = {}
+            for query, batch_domains in batches:
+                usage = {"api_calls": 0}
+                tbs = _oldest_time_filter(marks, "seed_domain", batch_domains)
+                future = executor.submit(_scan_seed_batch, client, query, batch_domains, tbs, usage)
+                futures[future] = (batch_domains, usage)
+            for future in as_completed(futures):
+                batch_domains, usage = futures[future]
+                try:
+                    pages, elapsed = future.result()
+                except Exception as exc:
+                    logger.warning("Seed batch of %d domains failed: %s", len(batch_domains), exc)
+                    failed_batches += 1
+                    for domain in batch_domains:
+                        by_domain[domain] = {"results": 0, "new_jobs": 0, "failed": True}
+                        yield_store.record_run(
+                            "seed_domain",
+                            domain,
+                            api_calls=usage["api_calls"] / len(batch_domains),
+                            results=0,
+                            new_jobs=0,
+                            label=domain,
+                        )
+                    continue
+                raw_results = [item for page in pages for item in page]
+                pages_fetched += len(pages)
+                watermarks.extend(("seed_domain", domain, scan_started, None) for domain in batch_domains)
+                total_scanned += len(raw_results)
+                for domain in batch_domains:
+                    # Batched domains share one request, so they share its latency.
+                    by_domain[domain] = {"results": 0, "new_jobs": 0, "elapsed_ms": round(elapsed * 1000)}
+
+                batch_jobs = [
+                    normalize_result(
+                        item, source="Discovery/SeedCompanies", is_new_company=True, classifier=classifier
+                    )
+                    for item in raw_results
+                ]
+                previously_seen = seen_store.seen_keys(job_key(job) for job in batch_jobs)
+                fresh: List[JobPosting] = []
+                for job in batch_jobs:
+                    matched = _match_seed_domain(job.url, batch_domains)
+                    if matched in by_domain:
+                        by_domain[matched]["results"] += 1
+                        if job_key(job) not in previously_seen:
+                            by_domain[matched]["new_jobs"] += 1
+                    if job.id in seen_ids:
+                        continue
+                    seen_ids.add(job.id)
+                    fresh.append(job)
+                jobs.extend(fresh)
+                if on_jobs is not None and fresh:
+                    on_jobs(fresh)
+
+                # The batch's requests are shared by its domains.
+                for domain in batch_domains:
+                    yield_store.record_run(
+                        "seed_domain",
+                        domain,
+                        api_calls=usage["api_calls"] / len(batch_domains),
+                        results=by_domain[domain]["results"],
+                        new_jobs=by_domain[domain]["new_jobs"],
+                        label=domain,
+                    )
+    finally:
+        marks.close()
+        seen_store.close()
+        yield_store.close()
 
     stats = {
         "new_jobs": len(jobs),
         "total_scanned": total_scanned,
         "duplicates_filtered": total_scanned - len(jobs),
         "by_source": {"Discovery/SeedCompanies": len(jobs)},
+        "by_domain": by_domain,
+        "batches_failed": failed_batches,
+        "pages_fetched": pages_fetched,
+        "api_calls": client.api_calls,
+        "watermarks": watermarks,
+        "cache": _cache_stats(client),
     }
 
     return jobs, stats
 
 
-def run_twitter_scan() -> Tuple[List[JobPosting], dict]:
+_TWITTER_SINCE_ID_MAX_AGE = 6.5 * 24 * 3600
+
+
+def run_twitter_scan(on_jobs: Optional[JobSink] = None) -> ScanResult:
     """Scan X (Twitter) for GIS job-related tweets.
 
-    Uses the recent search endpoint with GIS keywords and hiring language.
+    Uses the recent search endpoint with GIS keywords and hiring language,
+    paging through results and emitting each page's jobs as it arrives.
+
+    Each run asks for tweets newer than the newest one seen before. When
+    pagination stops early (TWITTER_MAX_RESULTS, the time budget or a rate
+    limit), the tweets between the last fetched one and the previous mark
+    are recorded as a gap, which later runs backfill with ``until_id`` once
+    the new tweets fit in their budget.
     """
 
     cfg = load_config()
+    classifier = get_classifier(cfg)
     if not cfg.twitter_bearer_token:
         return [], {"new_jobs": 0, "total_scanned": 0, "duplicates_filtered": 0, "by_source": {}}
 
-    client = TwitterClient(bearer_token=cfg.twitter_bearer_token)
+    client = TwitterClient(bearer_token=cfg.twitter_bearer_token, cache=get_response_cache())
 
     query = (
         "(GIS OR geospatial OR \"geographic information systems\" OR \"remote sensing\" "
         "OR \"spatial data\") (hiring OR \"we're hiring\" OR job OR jobs OR role) "
         "-is:retweet -is:reply lang:en"
     )
-
-    raw_tweets = client.search_gis_jobs(query, max_results=20)
+    key = _query_key(query)
+    max_results = int(os.getenv("TWITTER_MAX_RESULTS", "100"))
+    deadline = time.monotonic() + float(os.getenv("TWITTER_TIME_BUDGET_SECONDS", "60"))
 
     jobs: List[JobPosting] = []
     seen_ids: set[str] = set()
+    total_scanned = 0
 
-    for tweet in raw_tweets:
-        text = tweet.get("text", "")
-        author = tweet.get("author", {}) or {}
-        company = author.get("name") or author.get("username") or "Unknown Company"
-
-        # Try to pull a URL from entities if present
-        url = ""
-        entities = tweet.get("entities") or {}
-        urls = entities.get("urls") or []
-        if urls:
-            url = urls[0].get("expanded_url") or urls[0].get("url") or ""
-
-        job_dict = {
-            "title": text.split("\n")[0][:120] or "GIS-related tweet",
-            "snippet": text,
-            "link": url or f"https://twitter.com/{author.get('username', '')}/status/{tweet.get('id')}",
-            "company": company,
-            "location": "Unknown",
-        }
-
-        job = normalize_result(job_dict, source="Twitter", is_new_company=True)
-        if job.id in seen_ids:
-            continue
-        seen_ids.add(job.id)
-        jobs.append(job)
+    def fetch(since_id: Optional[str], until_id: Optional[str]) -> Tuple[Optional[str], Optional[str], bool]:
+        """One pass over (since_id, until_id); returns (newest id, oldest id, complete)."""
+
+        nonlocal total_scanned
+        newest: Optional[str] = None
+        oldest: Optional[str] = None
+        pages = client.iter_pages(
+            query,
+            max_results=max_results - total_scanned,
+            time_budget=max(deadline - time.monotonic(), 0),
+            since_id=since_id,
+            until_id=until_id,
+        )
+        for page in pages:
+            total_scanned += len(page)
+            page_jobs: List[JobPosting] = []
+            for tweet in page:
+                if tweet.get("id"):
+                    if newest is None or int(tweet["id"]) > int(newest):
+                        newest = tweet["id"]
+                    if oldest is None or int(tweet["id"]) < int(oldest):
+                        oldest = tweet["id"]
+
+                text = tweet.get("text", "")
+                author = tweet.get("author", {}) or {}
+                company = author.get("name") or author.get("username") or "Unknown Company"
+
+                # Try to pull a URL from entities if present
+                url = ""
+                entities = tweet.get("entities") or {}
+                urls = entities.get("urls") or []
+                if urls:
+                    url = urls[0].get("expanded_url") or urls[0].get("url") or ""
+
+                job_dict = {
+                    "title": text.split("\n")[0][:120] or "GIS-related tweet",
+                    "snippet": text,
+                    "link": url or f"https://twitter.com/{author.get('username', '')}/status/{tweet.get('id')}",
+                    "company": company,
+                    "location": "Unknown",
+                }
+
+                job = normalize_result(job_dict, source="Twitter", is_new_company=True, classifier=classifier)
+                if job.id in seen_ids:
+                    continue
+                seen_ids.add(job.id)
+                page_jobs.append(job)
+
+            jobs.extend(page_jobs)
+            if on_jobs is not None and page_jobs:
+                on_jobs(page_jobs)
+        return newest, oldest, client.exhausted
+
+    scan_started = time.time()
+    watermarks: List[PendingMark] = []
+    marks = WatermarkStore(cfg.database_url)
+    try:
+        mark = marks.get("twitter", key) if incremental_enabled() else None
+        # Recent search rejects a since_id older than its 7-day window; after a
+        # longer gap, search the whole window instead (which covers any gap).
+        if mark is not None and time.time() - mark.last_run_at > _TWITTER_SINCE_ID_MAX_AGE:
+            mark = None
+        # "<since_id>:<until_id>" of tweets a cut-short run did not reach ("" once
+        # filled, and an empty since_id means the start of the search window).
+        gap = marks.get("twitter_gap", key) if incremental_enabled() else None
+        if gap is not None and (not gap.last_id or time.time() - gap.last_run_at > _TWITTER_SINCE_ID_MAX_AGE):
+            gap = None
+        gap_bounds = gap.last_id.split(":") if gap is not None else None
+
+        newest, oldest, complete = fetch(mark.last_id if mark else None, None)
+        if mark or newest:
+            watermarks.append(("twitter", key, scan_started, newest))
+        if not complete and oldest is not None and incremental_enabled():
+            # Older unfetched tweets join any earlier gap; refetching the part
+            # in between is cheaper than tracking several gaps.
+            since = gap_bounds[0] if gap_bounds else (mark.last_id if mark else None) or ""
+            watermarks.append(("twitter_gap", key, scan_started, f"{since}:{oldest}"))
+        elif complete and gap_bounds and mark is None:
+            # That pass covered the whole search window, gap included.
+            watermarks.append(("twitter_gap", key, scan_started, ""))
+        elif complete and gap_bounds and total_scanned < max_results and time.monotonic() < deadline:
+            since, until = gap_bounds
+            _, oldest, complete = fetch(since or None, until)
+            if complete:
+                watermarks.append(("twitter_gap", key, scan_started, ""))
+            elif oldest is not None:
+                watermarks.append(("twitter_gap", key, scan_started, f"{since}:{oldest}"))
+    finally:
+        marks.close()
 
     stats = {
         "new_jobs": len(jobs),
-        "total_scanned": len(raw_tweets),
-        "duplicates_filtered": len(raw_tweets) - len(jobs),
+        "total_scanned": total_scanned,
+        "duplicates_filtered": total_scanned - len(jobs),
         "by_source": {"Twitter": len(jobs)},
+        "api_calls": client.api_calls,
+        "watermarks": watermarks,
+        "cache": _cache_stats(client),
     }
 
     return jobs, stats
 
 
-def run_full_scan() -> Tuple[List[JobPosting], dict]:
-    """Combine ATS-based scan, broad discovery, seed-company scan, and Twitter."""
+# Sources merged by ``run_full_scan``. Each entry is (name, scan function);
+# scan functions take an ``on_jobs`` sink. Per-provider concurrency is
+# enforced by the clients.
+FULL_SCAN_SOURCES: Tuple[Tuple[str, Callable[..., ScanResult]], ...] = (
+    ("ats", run_gis_scan),
+    ("boards", run_ats_board_scan),
+    ("discovery", run_discovery_scan),
+    ("seeds", run_company_seed_scan),
+    ("twitter", run_twitter_scan),
+)
+
+
+# Sources whose results depend on a profile's title keywords.
+_PROFILE_SOURCES = ("ats", "boards")
+
+
+def _source_timeout(name: str) -> float:
+    """Deadline in seconds for one source, e.g. SCAN_TIMEOUT_TWITTER_SECONDS=30.
+
+    Profile-specific sources ("ats:<profile>", "boards:<profile>") use their
+    base source's timeout.
+    """
+
+    default = os.getenv("SCAN_SOURCE_TIMEOUT_SECONDS", "120")
+    base = name.split(":", 1)[0]
+    return float(os.getenv(f"SCAN_TIMEOUT_{base.upper()}_SECONDS", default))
+
+
+def stream_full_scan(
+    stats: dict,
+    remember: bool = True,
+    sources: Optional[Iterable[Tuple[str, Callable[..., ScanResult]]]] = None,
+) -> Iterator[List[JobPosting]]:
+    """Yield batches of jobs from every source as soon as each batch is found.
+
+    Sources run concurrently (``FULL_SCAN_SOURCES`` by default). Each batch
+    passes through cross-source dedup (canonical URL, then near-duplicate
+    content); with ``remember`` only jobs missing from the persistent
+    seen-jobs store go on. With ENRICH_PAGES those are enriched from their
+    posting pages (``enrichment.PageEnricher``). Every deduplicated job is
+    added to the job index (``storage.job_index``) and the new ones are
+    yielded. Sources that raise or miss their deadline
+    (``_source_timeout``) are logged and skipped. ``stats`` is filled in
+    once the generator is exhausted.
+    """
 
-    ats_jobs, ats_stats = run_gis_scan()
-    discovery_jobs, discovery_stats = run_discovery_scan()
-    seed_jobs, seed_stats = run_company_seed_scan()
-    twitter_jobs, twitter_stats = run_twitter_scan()
+    for _, batch in _stream_sources(stats, remember, FULL_SCAN_SOURCES if sources is None else sources):
+        yield batch
 
-    all_jobs = ats_jobs + discovery_jobs + seed_jobs + twitter_jobs
 
-    # Cross-source deduplication by URL (or id fallback).
-    unique_jobs: List[JobPosting] = []
-    seen_keys: set[str] = set()
-    for job in all_jobs:
-        key = job.url or job.id
-        if key in seen_keys:
-            continue
-        seen_keys.add(key)
-        unique_jobs.append(job)
+def stream_profile_scan(
+    profiles: Iterable[ScanProfile], stats: dict, remember: bool = True, only: Optional[Iterable[str]] = None
+) -> Iterator[Tuple[ScanProfile, List[JobPosting]]]:
+    """Run several profiles as one coalesced scan, yielding (profile, batch).
 
-    total_scanned = (
-        ats_stats.get("total_scanned", 0)
-        + discovery_stats.get("total_scanned", 0)
-        + seed_stats.get("total_scanned", 0)
-        + twitter_stats.get("total_scanned", 0)
+    Sources shared by the profiles (discovery, seeds, twitter) run once, as
+    do the keyword-driven sources (ats, boards) for profiles with identical
+    title keywords; each batch is routed to every profile that asked for its
+    source. Dedup and the seen-jobs store are shared, so a job is reported
+    once across profiles. ``only`` limits the run to some of the
+    ``profile_source_names``.
+    """
+
+    for targets, batch in stream_profile_batches(profiles, stats, remember, only=only):
+        for profile in targets:
+            yield profile, batch
+
+
+def _plan_profile_sources(
+    profiles: Iterable[ScanProfile],
+) -> Tuple[List[Tuple[str, Callable[..., ScanResult]]], Dict[str, List[ScanProfile]]]:
+    scan_funcs = dict(FULL_SCAN_SOURCES)
+    sources: List[Tuple[str, Callable[..., ScanResult]]] = []
+    routes: Dict[str, List[ScanProfile]] = {}
+    keyword_names: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+
+    for profile in profiles:
+        for source in profile.sources:
+            name = source
+            if source in _PROFILE_SOURCES:
+                name = keyword_names.setdefault((source, profile.title_keywords), f"{source}:{profile.name}")
+            if name not in routes:
+                func = scan_funcs[source]
+                if source in _PROFILE_SOURCES:
+                    func = partial(func, profile=profile.name)
+                sources.append((name, func))
+                routes[name] = []
+            routes[name].append(profile)
+    return sources, routes
+
+
+def profile_source_names(profiles: Iterable[ScanProfile]) -> List[str]:
+    """Names of the sources a coalesced run of ``profiles`` would start.
+
+    Shared sources keep their plain name ("discovery"); keyword-driven ones
+    are named after the first profile using their keywords ("ats:gis_default").
+    """
+
+    return [name for name, _ in _plan_profile_sources(profiles)[0]]
+
+
+def stream_profile_batches(
+    profiles: Iterable[ScanProfile],
+    stats: dict,
+    remember: bool = True,
+    finish: bool = True,
+    only: Optional[Iterable[str]] = None,
+    mark_seen: bool = True,
+) -> Iterator[Tuple[List[ScanProfile], List[JobPosting]]]:
+    """Like ``stream_profile_scan`` but yields each batch once, with its profiles.
+
+    With ``finish=False`` batches are yielded right after dedup, without
+    enrichment or indexing, and with ``mark_seen=False`` jobs missing from
+    the seen-jobs store are yielded without being recorded there (see
+    ``workers.produce``). ``only`` limits the run to some of the
+    ``profile_source_names``.
+    """
+
+    sources, routes = _plan_profile_sources(profiles)
+    if only is not None:
+        only = set(only)
+        sources = [(name, func) for name, func in sources if name in only]
+        routes = {name: routes[name] for name, _ in sources}
+
+    stats["profiles"] = sorted({profile.name for targets in routes.values() for profile in targets})
+    for name, batch in _stream_sources(stats, remember, sources, finish, mark_seen):
+        yield routes[name], batch
+
+
+def _stream_sources(
+    stats: dict,
+    remember: bool,
+    sources: Iterable[Tuple[str, Callable[..., ScanResult]]],
+    finish: bool = True,
+    mark_seen: bool = True,
+) -> Iterator[Tuple[str, List[JobPosting]]]:
+    """Engine behind stream_full_scan/stream_profile_scan; yields (source name, batch)."""
+
+    cfg = load_config()
+    sources = list(sources)
+    deduplicator = JobDeduplicator(cfg.ats_domains)
+    store = SeenJobStore(cfg.database_url) if remember else None
+    index = JobIndex(cfg.database_url) if finish else None
+    marks = WatermarkStore(cfg.database_url)
+    enricher = PageEnricher(PageCache(cfg.database_url)) if finish and enrichment_enabled() else None
+    events: queue.Queue = queue.Queue()
+
+    def runner(name: str, func: Callable[..., ScanResult]) -> None:
+        try:
+            result = func(on_jobs=lambda jobs: events.put(("jobs", name, jobs)))
+        except Exception as exc:
+            events.put(("error", name, exc))
+        else:
+            events.put(("done", name, result))
+
+    started = time.monotonic()
+    deadlines = {name: started + _source_timeout(name) for name, _ in sources}
+    pending = set(deadlines)
+    source_stats: Dict[str, dict] = {}
+    failed_sources: Dict[str, str] = {}
+    emitted: Dict[str, int] = {}
+    fresh_by_source: Dict[str, int] = {}
+    unique_count = 0
+    new_count = 0
+
+    executor = ThreadPoolExecutor(max_workers=max(len(sources), 1), thread_name_prefix="scan")
+    try:
+        for name, func in sources:
+            executor.submit(runner, name, func)
+
+        while pending:
+            timeout = min(deadlines[name] for name in pending) - time.monotonic()
+            try:
+                kind, name, payload = events.get(timeout=max(timeout, 0))
+            except queue.Empty:
+                now = time.monotonic()
+                for name in [n for n in pending if deadlines[n] <= now]:
+                    logger.warning("Source %s missed its deadline; skipping", name)
+                    failed_sources[name] = "timeout"
+                    pending.discard(name)
+                continue
+
+            if name not in pending:
+                # Late output from a source that already missed its deadline.
+                continue
+            if kind == "jobs":
+                batch = payload
+                emitted[name] = emitted.get(name, 0) + len(batch)
+                with metrics.timer("dedup"):
+                    unique = deduplicator.unique(batch)
+                unique_count += len(unique)
+                fresh = unique
+                if store is not None:
+                    with metrics.timer("seen_store"):
+                        fresh = store.filter_new(unique)
+                        if mark_seen:
+                            store.mark_seen(fresh)
+                if enricher is not None and fresh:
+                    with metrics.timer("enrich"):
+                        enricher.enrich(fresh)
+                if index is not None:
+                    with metrics.timer("job_index"):
+                        index.add(unique)
+                new_count += len(fresh)
+                fresh_by_source[name] = fresh_by_source.get(name, 0) + len(fresh)
+                if fresh:
+                    yield name, fresh
+            elif kind == "done":
+                source_stats[name] = payload[1]
+                pending.discard(name)
+                # A source that failed or timed out keeps its old marks, so
+                # the next run asks for the results this one dropped again.
+                for mark in payload[1].pop("watermarks", ()):
+                    marks.set(*mark)
+            else:
+                logger.error("Source %s failed; skipping", name, exc_info=payload)
+                failed_sources[name] = f"error: {payload}"
+                pending.discard(name)
+    finally:
+        # Do not wait for stragglers: their results are already discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+        marks.close()
+        if store is not None:
+            store.close()
+        if index is not None:
+            index.close()
+        if enricher is not None:
+            enricher.close()
+            enricher.cache.close()
+
+    # Failed sources report no stats; count what they emitted before failing.
+    total_scanned = sum(s.get("total_scanned", 0) for s in source_stats.values()) + sum(
+        emitted.get(name, 0) for name in failed_sources
     )
-    duplicates_filtered = total_scanned - len(unique_jobs)
+    # Postings a source dropped itself for not matching the profile's keywords.
+    irrelevant = sum(s.get("irrelevant", 0) for s in source_stats.values())
 
-    by_source = ats_stats.get("by_source", {}).copy()
-    for stats in (discovery_stats, seed_stats, twitter_stats):
-        for src, count in stats.get("by_source", {}).items():
+    by_source: Dict[str, int] = {}
+    cache = {"hits": 0, "misses": 0}
+    for name, _ in sources:
+        for src, count in source_stats.get(name, {}).get("by_source", {}).items():
             by_source[src] = by_source.get(src, 0) + count
-
-    stats = {
-        "new_jobs": len(unique_jobs),
-        "total_scanned": total_scanned,
-        "duplicates_filtered": duplicates_filtered,
-        "by_source": by_source,
+        for field in cache:
+            cache[field] += source_stats.get(name, {}).get("cache", {}).get(field, 0)
+
+    # Per source, for the adaptive scheduler (see adaptive.py).
+    per_source = {
+        name: {
+            "api_calls": source_stats.get(name, {}).get("api_calls", 0),
+            "results": emitted.get(name, 0),
+            "new_jobs": fresh_by_source.get(name, 0),
+            "failed": name in failed_sources,
+        }
+        for name, _ in sources
     }
 
-    return unique_jobs, stats
+    stats.update(
+        {
+            "new_jobs": new_count,
+            "total_scanned": total_scanned,
+            "irrelevant": irrelevant,
+            "duplicates_filtered": total_scanned - irrelevant - unique_count,
+            "near_duplicates_filtered": deduplicator.near_duplicates,
+            "by_source": by_source,
+            "failed_sources": failed_sources,
+            "per_source": per_source,
+            "cache": cache,
+        }
+    )
+    if enricher is not None:
+        stats["enrichment"] = dict(enricher.counts)
+    if remember:
+        stats["previously_seen"] = unique_count - new_count
+
+
+def run_full_scan(remember: bool = True) -> ScanResult:
+    """Combine ATS-based scan, broad discovery, seed-company scan, and Twitter.
+
+    Collects ``stream_full_scan``; with ``remember`` (the default) only jobs
+    unseen by earlier runs are returned.
+    """
+
+    stats: dict = {}
+    jobs = [job for batch in stream_full_scan(stats, remember=remember) for job in batch]
+    return jobs, stats
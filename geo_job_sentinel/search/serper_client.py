@@ -1,30 +1,99 @@
 from __future__ import annotations
 
 import os
-from typing import Dict, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 
-import requests
+from .. import transport
+from ..metrics import metrics
+from ..storage.response_cache import ResponseCache
+from .limits import provider_bucket, provider_slot
+
+
+# Google's "past hour/day/week/month" filters, narrowest first.
+_TIME_FILTERS = (
+    (3600, "qdr:h"),
+    (86400, "qdr:d"),
+    (7 * 86400, "qdr:w"),
+    (31 * 86400, "qdr:m"),
+)
+
+# Runs on a fixed schedule drift by a few minutes either way, so a daily run
+# may start just past 24h after the last one; allow 10% slack per window.
+_TIME_FILTER_GRACE = 1.1
+
+
+def time_filter_since(last_run_at: Optional[float], now: Optional[float] = None) -> Optional[str]:
+    """Narrowest ``tbs`` filter covering everything since ``last_run_at``, if any."""
+
+    if last_run_at is None:
+        return None
+    elapsed = (now or time.time()) - last_run_at
+    for window, tbs in _TIME_FILTERS:
+        if elapsed <= window * _TIME_FILTER_GRACE:
+            return tbs
+    return None
 
 
 class SerperClient:
     """Minimal Serper.dev Google Search client.
 
-    Expects SERPER_API_KEY in the environment.
+    Expects SERPER_API_KEY in the environment. When a ``cache`` is given,
+    identical queries are answered from it and counted in ``cache_hits`` /
+    ``cache_misses``. Requests actually sent (metered) are counted in
+    ``api_calls``.
     """
 
     BASE_URL = "https://google.serper.dev/search"
 
-    def __init__(self, api_key: str | None = None) -> None:
+    def __init__(self, api_key: str | None = None, cache: Optional[ResponseCache] = None) -> None:
         self.api_key = api_key or os.getenv("SERPER_API_KEY", "")
+        self.cache = cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.api_calls = 0
+        self._counter_lock = threading.Lock()
+
+    def search_jobs(
+        self,
+        query: str,
+        num: int = 20,
+        page: int = 1,
+        tbs: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> List[Dict]:
+        """One page of organic results. A sent request also counts in ``usage["api_calls"]``."""
 
-    def search_jobs(self, query: str, num: int = 20) -> List[Dict]:
         if not self.api_key:
             raise RuntimeError("SERPER_API_KEY not configured")
 
         headers = {"X-API-KEY": self.api_key, "Content-Type": "application/json"}
         # Use a conservative number of results for reliability
         payload = {"q": query, "num": min(max(num, 1), 10)}
-        resp = requests.post(self.BASE_URL, json=payload, headers=headers, timeout=30)
+        if page > 1:
+            payload["page"] = page
+        if tbs:
+            payload["tbs"] = tbs
+
+        if self.cache is not None:
+            cached = self.cache.get("serper", payload)
+            with self._counter_lock:
+                if cached is not None:
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
+            if cached is not None:
+                return cached
+
+        with self._counter_lock:
+            self.api_calls += 1
+            if usage is not None:
+                usage["api_calls"] = usage.get("api_calls", 0) + 1
+        provider_bucket("serper").acquire()
+        with provider_slot("serper"), metrics.timer("provider_call", provider="serper"):
+            resp = transport.post(self.BASE_URL, json=payload, headers=headers, timeout=30)
 
         if resp.status_code >= 400:
             # Surface Serper error details so we can debug in logs
@@ -35,4 +104,64 @@ class SerperClient:
             raise RuntimeError(f"Serper error {resp.status_code}: {detail}")
 
         data = resp.json()
-        return data.get("organic", [])
+        results = data.get("organic", [])
+        if self.cache is not None:
+            self.cache.put("serper", payload, results)
+        return results
+
+    def iter_pages(
+        self,
+        query: str,
+        max_pages: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        tbs: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> Iterator[List[Dict]]:
+        """Yield result pages for ``query`` in order, up to ``max_pages`` deep.
+
+        Page 1 is fetched first; later pages are fetched ``concurrency`` at a
+        time (SERPER_MAX_PAGES, default 3; SERPER_PAGE_CONCURRENCY, default 2).
+        Iteration stops early at a short page or once a page adds no links
+        that earlier pages had not already returned. Every request sent for
+        this query, including empty or discarded pages, is counted in
+        ``usage["api_calls"]``.
+        """
+
+        if max_pages is None:
+            max_pages = int(os.getenv("SERPER_MAX_PAGES", "3"))
+        if concurrency is None:
+            concurrency = int(os.getenv("SERPER_PAGE_CONCURRENCY", "2"))
+        concurrency = max(concurrency, 1)
+
+        seen_links: set[str] = set()
+
+        def contributes(results: List[Dict]) -> bool:
+            links = {item.get("link") or item.get("url") or "" for item in results}
+            new_links = links - seen_links
+            seen_links.update(links)
+            return bool(new_links)
+
+        first = self.search_jobs(query, num=10, tbs=tbs, usage=usage)
+        if not contributes(first):
+            return
+        yield first
+        if len(first) < 10:
+            return
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="serper-page") as executor:
+            next_page = 2
+            while next_page <= max_pages:
+                window = range(next_page, min(next_page + concurrency, max_pages + 1))
+                futures = [executor.submit(self.search_jobs, query, 10, page, tbs, usage) for page in window]
+                for future in futures:
+                    results = future.result()
+                    if not contributes(results):
+                        for pending in futures:
+                            pending.cancel()
+                        return
+                    yield results
+                    if len(results) < 10:
+                        for pending in futures:
+                            pending.cancel()
+                        return
+                next_page += concurrency
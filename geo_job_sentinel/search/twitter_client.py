@@ -1,36 +1,63 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
 
-import requests
+from .. import transport
+from ..metrics import metrics
+from ..storage.response_cache import ResponseCache
+from .limits import provider_bucket, provider_slot
+
+
+logger = logging.getLogger("geo_job_sentinel.twitter")
 
 
 class TwitterClient:
     """Minimal Twitter API v2 recent search client using a bearer token.
 
     This expects a bearer token with access to the recent search endpoint.
+    Response pages are served from ``cache`` when one is given.
     """
 
     BASE_URL = "https://api.twitter.com/2/tweets/search/recent"
 
-    def __init__(self, bearer_token: Optional[str]) -> None:
+    def __init__(self, bearer_token: Optional[str], cache: Optional[ResponseCache] = None) -> None:
         if not bearer_token:
             raise RuntimeError("TWITTER_BEARER_TOKEN not configured")
         self.bearer_token = bearer_token
+        self.cache = cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.api_calls = 0
+        # Whether the last ``iter_pages`` followed pagination to its end.
+        self.exhausted = False
+        self._counter_lock = threading.Lock()
 
-    def search_gis_jobs(self, query: str, max_results: int = 10) -> List[Dict]:
-        headers = {"Authorization": f"Bearer {self.bearer_token}"}
+    def _fetch_page(self, params: dict) -> Optional[dict]:
+        """Fetch one response page; returns None when rate limited mid-stream."""
 
-        params = {
-            "query": query,
-            "max_results": max(10, min(max_results, 50)),
-            "tweet.fields": "created_at,public_metrics,entities",
-            "expansions": "author_id",
-            "user.fields": "name,username",
-        }
+        if self.cache is not None:
+            cached = self.cache.get("twitter", params)
+            with self._counter_lock:
+                if cached is not None:
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
+            if cached is not None:
+                return cached
 
-        resp = requests.get(self.BASE_URL, headers=headers, params=params, timeout=30)
+        headers = {"Authorization": f"Bearer {self.bearer_token}"}
+        with self._counter_lock:
+            self.api_calls += 1
+        provider_bucket("twitter").acquire()
+        with provider_slot("twitter"), metrics.timer("provider_call", provider="twitter"):
+            resp = transport.get(self.BASE_URL, headers=headers, params=params, timeout=30)
 
+        if resp.status_code == 429 and "next_token" in params:
+            return None
         if resp.status_code >= 400:
             try:
                 detail = resp.json()
@@ -39,14 +66,97 @@ class TwitterClient:
             raise RuntimeError(f"Twitter error {resp.status_code}: {detail}")
 
         data = resp.json()
+        if self.cache is not None:
+            self.cache.put("twitter", params, data)
+
+        remaining = resp.headers.get("x-rate-limit-remaining")
+        reset = resp.headers.get("x-rate-limit-reset")
+        if remaining is not None and reset is not None:
+            data = {**data, "_rate_limit": {"remaining": int(remaining), "reset": float(reset)}}
+        return data
+
+    def iter_pages(
+        self,
+        query: str,
+        max_results: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+    ) -> Iterator[List[Dict]]:
+        """Yield pages of tweets, newest first, following ``meta.next_token``.
+
+        Stops after ``max_results`` tweets (TWITTER_MAX_RESULTS, default 100)
+        or ``time_budget`` seconds (TWITTER_TIME_BUDGET_SECONDS, default 60).
+        When the window's requests are used up, waits for
+        ``x-rate-limit-reset`` if that fits the time budget and stops
+        otherwise. ``exhausted`` tells afterwards whether every tweet between
+        ``since_id`` and ``until_id`` was returned. Each tweet is a copy with
+        its ``author`` attached from a users index shared across pages.
+        """
+
+        if max_results is None:
+            max_results = int(os.getenv("TWITTER_MAX_RESULTS", "100"))
+        if time_budget is None:
+            time_budget = float(os.getenv("TWITTER_TIME_BUDGET_SECONDS", "60"))
+        deadline = time.monotonic() + time_budget
+
+        self.exhausted = False
+        users_index: Dict[str, Dict] = {}
+        fetched = 0
+        next_token: Optional[str] = None
+
+        while fetched < max_results:
+            params = {
+                "query": query,
+                # The endpoint accepts 10-100 results per page.
+                "max_results": max(10, min(max_results - fetched, 100)),
+                "tweet.fields": "created_at,public_metrics,entities",
+                "expansions": "author_id",
+                "user.fields": "name,username",
+            }
+            if since_id:
+                params["since_id"] = since_id
+            if until_id:
+                params["until_id"] = until_id
+            if next_token:
+                params["next_token"] = next_token
+
+            data = self._fetch_page(params)
+            if data is None:
+                logger.warning("Twitter rate limit reached; stopping after %d tweets", fetched)
+                return
+
+            for user in data.get("includes", {}).get("users", []):
+                users_index[user["id"]] = user
+
+            page = []
+            for tweet in data.get("data", [])[: max_results - fetched]:
+                author = users_index.get(tweet.get("author_id"))
+                page.append({**tweet, "author": author} if author else dict(tweet))
+            fetched += len(page)
+            if page:
+                yield page
 
-        tweets = data.get("data", [])
-        users_index = {u["id"]: u for u in data.get("includes", {}).get("users", [])}
+            next_token = data.get("meta", {}).get("next_token")
+            if not next_token:
+                self.exhausted = True
+                return
+            if time.monotonic() >= deadline:
+                return
 
-        # Attach author info to each tweet for downstream normalization
-        for tweet in tweets:
-            author = users_index.get(tweet.get("author_id"))
-            if author:
-                tweet["author"] = author
+            rate_limit = data.get("_rate_limit")
+            if rate_limit and rate_limit["remaining"] <= 0:
+                wait = rate_limit["reset"] - time.time()
+                if time.monotonic() + wait > deadline:
+                    logger.info("Twitter rate limit resets in %.0fs; stopping pagination", wait)
+                    return
+                time.sleep(max(wait, 0))
 
-        return tweets
+    def search_gis_jobs(
+        self, query: str, max_results: int = 10, since_id: Optional[str] = None
+    ) -> List[Dict]:
+        return [
+            tweet
+            for page in self.iter_pages(query, max_results=max_results, since_id=since_id)
+            for tweet in page
+        ]
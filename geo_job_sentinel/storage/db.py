@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from ..config_loader import BASE_DIR
+
+
+def sqlite_path(database_url: str) -> str:
+    """Resolve a ``sqlite:///`` DATABASE_URL to a filesystem path.
+
+    Relative paths are resolved against the project root, like the JSON
+    config files. ``sqlite:///:memory:`` is passed through unchanged.
+    """
+
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise RuntimeError(f"Unsupported DATABASE_URL (only sqlite:/// is supported): {database_url}")
+
+    path = database_url[len(prefix):]
+    if path == ":memory:":
+        return path
+    resolved = Path(path) if Path(path).is_absolute() else BASE_DIR / path
+    resolved.parent.mkdir(parents=True, exist_ok=True)
+    return str(resolved)
+
+
+def connect(database_url: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(sqlite_path(database_url), timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
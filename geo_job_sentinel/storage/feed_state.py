@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+from .db import connect
+
+
+class FeedState(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: Optional[str]  # catches unchanged feeds from servers without validators
+    items: List[dict]  # postings parsed from the body, reused while it is unchanged
+
+
+class FeedStateStore:
+    """Validators of every polled ATS board feed, for conditional re-polling.
+
+    The postings parsed from each feed are stored with its validators, so an
+    unchanged feed still yields its postings without being downloaded or
+    parsed again.
+    """
+
+    def __init__(self, database_url: str) -> None:
+        self._conn = connect(database_url)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ats_feeds (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body_hash TEXT,
+                    jobs INTEGER NOT NULL DEFAULT 0,
+                    checked_at REAL NOT NULL,
+                    items TEXT NOT NULL
+                )
+                """
+            )
+
+    def get(self, url: str) -> Optional[FeedState]:
+        """The feed's last state; None if it was never fetched."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body_hash, items FROM ats_feeds WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body_hash, items = row
+        return FeedState(etag, last_modified, body_hash, json.loads(items))
+
+    def set(self, url: str, state: FeedState) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO ats_feeds (url, etag, last_modified, body_hash, jobs, checked_at, items)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    body_hash = excluded.body_hash,
+                    jobs = excluded.jobs,
+                    checked_at = excluded.checked_at,
+                    items = excluded.items
+                """,
+                (
+                    url,
+                    state.etag,
+                    state.last_modified,
+                    state.body_hash,
+                    len(state.items),
+                    time.time(),
+                    json.dumps(state.items),
+                ),
+            )
+
+    def touch(self, url: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE ats_feeds SET checked_at = ? WHERE url = ?", (time.time(), url))
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from ..models import JobPosting, LocationType
+from .db import connect
+from .seen_jobs import job_key
+
+
+class JobIndex:
+    """Searchable record of every job the pipeline has found.
+
+    Postings live in ``job_index`` (one row per canonical URL, with the
+    first and last time a scan found them); an FTS5 table over title,
+    company, location and snippet is kept in sync by triggers. Searches
+    combine a full-text match with filters on location type, category,
+    source and discovery date, and never touch a provider.
+    """
+
+    def __init__(self, database_url: str) -> None:
+        self._conn = connect(database_url)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS job_index (
+                    url_key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    company TEXT,
+                    location TEXT,
+                    snippet TEXT,
+                    source TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    location_type TEXT NOT NULL,
+                    is_new_company INTEGER NOT NULL DEFAULT 0,
+                    discovered_at TEXT NOT NULL,
+                    last_seen TEXT NOT NULL,
+                    salary TEXT,
+                    posted_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS job_index_discovered ON job_index (discovered_at);
+                CREATE INDEX IF NOT EXISTS job_index_type ON job_index (location_type, discovered_at);
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS job_index_fts USING fts5 (
+                    title, company, location, snippet,
+                    content = 'job_index', tokenize = 'porter unicode61'
+                );
+                CREATE TRIGGER IF NOT EXISTS job_index_ai AFTER INSERT ON job_index BEGIN
+                    INSERT INTO job_index_fts (rowid, title, company, location, snippet)
+                    VALUES (new.rowid, new.title, new.company, new.location, new.snippet);
+                END;
+                CREATE TRIGGER IF NOT EXISTS job_index_ad AFTER DELETE ON job_index BEGIN
+                    INSERT INTO job_index_fts (job_index_fts, rowid, title, company, location, snippet)
+                    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.snippet);
+                END;
+                CREATE TRIGGER IF NOT EXISTS job_index_au AFTER UPDATE OF title, company, location, snippet
+                ON job_index BEGIN
+                    INSERT INTO job_index_fts (job_index_fts, rowid, title, company, location, snippet)
+                    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.snippet);
+                    INSERT INTO job_index_fts (rowid, title, company, location, snippet)
+                    VALUES (new.rowid, new.title, new.company, new.location, new.snippet);
+                END;
+                """
+            )
+
+    def add(self, jobs: Iterable[JobPosting]) -> None:
+        """Insert new postings; for known ones only ``last_seen`` moves."""
+
+        now = datetime.utcnow().isoformat()
+        rows = [
+            (
+                job_key(job),
+                job.url,
+                job.title,
+                job.company,
+                job.location,
+                job.description_snippet,
+                job.source,
+                job.category,
+                job.location_type.value,
+                int(job.is_new_company),
+                job.discovered_at.isoformat(),
+                now,
+                job.salary,
+                job.posted_at,
+            )
+            for job in jobs
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO job_index (url_key, url, title, company, location, snippet, source, category,
+                                       location_type, is_new_company, discovered_at, last_seen, salary, posted_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url_key) DO UPDATE SET last_seen = excluded.last_seen
+                """,
+                rows,
+            )
+
+    def search(
+        self,
+        text: str = "",
+        location_type: Optional[LocationType] = None,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 10,
+    ) -> List[JobPosting]:
+        """Newest postings matching every given filter.
+
+        ``text`` is matched word by word (all words, any order, stemmed)
+        against title, company, location and snippet. ``category`` is
+        compared case-insensitively; ``source`` matches any part of the
+        source name, e.g. ``"twitter"``.
+        """
+
+        where: List[str] = []
+        params: list = []
+        words = [word.replace('"', "") for word in text.split()]
+        words = [f'"{word}"' for word in words if word]
+        if words:
+            where.append("j.rowid IN (SELECT rowid FROM job_index_fts WHERE job_index_fts MATCH ?)")
+            params.append(" ".join(words))
+        if location_type is not None:
+            where.append("j.location_type = ?")
+            params.append(location_type.value)
+        if category:
+            where.append("j.category = ? COLLATE NOCASE")
+            params.append(category)
+        if source:
+            where.append("j.source LIKE ?")
+            params.append(f"%{source}%")
+        if since is not None:
+            where.append("j.discovered_at >= ?")
+            params.append(since.isoformat())
+
+        sql = (
+            "SELECT url, title, company, location, snippet, source, category, location_type, "
+            "is_new_company, discovered_at, salary, posted_at FROM job_index AS j"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY j.discovered_at DESC LIMIT ?"
+        )
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [
+            JobPosting(
+                id=url,
+                title=title,
+                company=company or "Unknown Company",
+                location=location or "Unknown",
+                source=source_name,
+                url=url,
+                description_snippet=snippet or "",
+                category=category_name,
+                is_new_company=bool(is_new_company),
+                location_type=LocationType(kind),
+                discovered_at=datetime.fromisoformat(discovered_at),
+                salary=salary,
+                posted_at=posted_at,
+            )
+            for (url, title, company, location, snippet, source_name, category_name, kind, is_new_company,
+                 discovered_at, salary, posted_at) in rows
+        ]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM job_index").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
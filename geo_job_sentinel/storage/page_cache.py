@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from .db import connect
+
+
+class CachedPage(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    details: dict  # output of enrichment.parse_job_page
+    fetched_at: float
+
+
+class PageCache:
+    """Details parsed from job posting pages, keyed by URL with its validators.
+
+    A page is fetched and parsed once; later runs reuse the details, and
+    once an entry is old enough to revalidate they send its ETag /
+    Last-Modified so an unchanged page costs a 304 and no parsing.
+    """
+
+    def __init__(self, database_url: str) -> None:
+        self._conn = connect(database_url)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS page_details (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    details TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, details, fetched_at FROM page_details WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, details, fetched_at = row
+        return CachedPage(etag, last_modified, json.loads(details), fetched_at)
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], details: dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_details (url, etag, last_modified, details, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, json.dumps(details), time.time()),
+            )
+
+    def touch(self, url: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE page_details SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from ..config_loader import load_config
+from .db import connect
+
+
+class ResponseCache:
+    """SQLite-backed cache of provider responses with TTL and LRU size eviction.
+
+    Entries are keyed on provider + request parameters. Expired entries are
+    ignored on read and purged on write; when the cache grows past
+    ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, database_url: str, ttl_seconds: float, max_bytes: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._conn = connect(database_url)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_response_cache_last_used ON response_cache (last_used)"
+            )
+
+    @staticmethod
+    def make_key(provider: str, params: dict) -> str:
+        raw = json.dumps([provider, params], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, provider: str, params: dict) -> Optional[Any]:
+        key = self.make_key(provider, params)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM response_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                return None
+            self._conn.execute("UPDATE response_cache SET last_used = ? WHERE cache_key = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, provider: str, params: dict, value: Any) -> None:
+        key = self.make_key(provider, params)
+        payload = json.dumps(value, default=str)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache "
+                "(cache_key, provider, payload, size, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, payload, len(payload), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM response_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()[0]
+        while total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT cache_key, size FROM response_cache ORDER BY last_used LIMIT 50"
+            ).fetchall()
+            if not rows:
+                break
+            for cache_key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM response_cache WHERE cache_key = ?", (cache_key,))
+                total -= size
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the shared response cache, or None when SEARCH_CACHE_TTL_SECONDS is 0.
+
+    Defaults: 1 hour TTL, 50 MB (SEARCH_CACHE_MAX_BYTES), stored in DATABASE_URL.
+    """
+
+    global _cache
+    ttl = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "3600"))
+    if ttl <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            max_bytes = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+            _cache = ResponseCache(load_config().database_url, ttl_seconds=ttl, max_bytes=max_bytes)
+        return _cache
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Iterable, List
+
+from ..models import JobPosting
+from ..urls import canonical_url
+from .db import connect
+
+
+# SQLite caps bound parameters per statement (999 on older builds).
+_CHUNK = 500
+
+
+def job_key(job: JobPosting) -> str:
+    return canonical_url(job.url) or job.id
+
+
+class SeenJobStore:
+    """Persistent record of every job already reported, keyed by canonical URL."""
+
+    def __init__(self, database_url: str) -> None:
+        self._conn = connect(database_url)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS seen_jobs (
+                    url_key TEXT PRIMARY KEY,
+                    job_id TEXT NOT NULL,
+                    title TEXT,
+                    company TEXT,
+                    source TEXT,
+                    first_seen TEXT NOT NULL
+                )
+                """
+            )
+
+    def seen_keys(self, keys: Iterable[str]) -> set[str]:
+        """Return the subset of ``keys`` that is already stored."""
+
+        keys = list(dict.fromkeys(keys))
+        found: set[str] = set()
+        with self._lock:
+            for i in range(0, len(keys), _CHUNK):
+                chunk = keys[i : i + _CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT url_key FROM seen_jobs WHERE url_key IN ({placeholders})", chunk
+                )
+                found.update(row[0] for row in rows)
+        return found
+
+    def filter_new(self, jobs: Iterable[JobPosting]) -> List[JobPosting]:
+        jobs = list(jobs)
+        seen = self.seen_keys(job_key(job) for job in jobs)
+        return [job for job in jobs if job_key(job) not in seen]
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        """Stored keys starting with ``prefix`` (a range scan on the primary key)."""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url_key FROM seen_jobs WHERE url_key >= ? AND url_key < ?",
+                (prefix, prefix + "\uffff"),
+            )
+            return [row[0] for row in rows]
+
+    def mark_seen(self, jobs: Iterable[JobPosting]) -> None:
+        now = datetime.utcnow().isoformat()
+        rows = [(job_key(job), job.id, job.title, job.company, job.source, now) for job in jobs]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_jobs (url_key, job_id, title, company, source, first_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import NamedTuple, Optional
+
+from .db import connect
+
+
+class Watermark(NamedTuple):
+    last_run_at: float  # unix time the last successful scan started
+    last_id: Optional[str]  # provider-specific cursor, e.g. newest tweet id
+
+
+def incremental_enabled() -> bool:
+    return os.getenv("INCREMENTAL_SCANS", "1") not in ("0", "false", "no")
+
+
+class WatermarkStore:
+    """High-water marks per source and query, for fetching only newer results."""
+
+    def __init__(self, database_url: str) -> None:
+        self._conn = connect(database_url)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scan_watermarks (
+                    scope TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    last_run_at REAL NOT NULL,
+                    last_id TEXT,
+                    PRIMARY KEY (scope, key)
+                )
+                """
+            )
+
+    def get(self, scope: str, key: str) -> Optional[Watermark]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_run_at, last_id FROM scan_watermarks WHERE scope = ? AND key = ?",
+                (scope, key),
+            ).fetchone()
+        return Watermark(*row) if row else None
+
+    def set(self, scope: str, key: str, last_run_at: float, last_id: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO scan_watermarks (scope, key, last_run_at, last_id) VALUES (?, ?, ?, ?)
+                ON CONFLICT (scope, key) DO UPDATE SET
+                    last_run_at = excluded.last_run_at,
+                    last_id = COALESCE(excluded.last_id, last_id)
+                """,
+                (scope, key, last_run_at, last_id),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Iterable, List, NamedTuple, Tuple
+
+from .db import connect
+
+
+class Lease(NamedTuple):
+    id: int
+    token: str  # proves the holder still owns the item when acking
+    payload: Any
+    attempts: int
+
+
+class WorkQueue:
+    """Durable multi-process work queue in the DATABASE_URL database.
+
+    Producers ``put`` items under a dedup key; putting a key that is already
+    queued (or finished within WORK_QUEUE_RETENTION_SECONDS, default one
+    day) is a no-op, so a restarted producer can safely re-send. Consumers
+    ``lease`` items, which hides them from other consumers for a visibility
+    timeout; items neither acked nor failed by then (e.g. the worker died)
+    become visible again. ``ack`` and ``fail`` only apply while the lease
+    token is still current, so late or repeated acks are harmless. Items
+    leased WORK_QUEUE_MAX_ATTEMPTS times (default 5) without an ack, whether
+    they failed or their lease expired, are parked as ``dead``; putting
+    their key again queues it afresh.
+    """
+
+    def __init__(self, database_url: str, name: str = "jobs") -> None:
+        self.name = name
+        self.max_attempts = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "5"))
+        self.retention = float(os.getenv("WORK_QUEUE_RETENTION_SECONDS", str(24 * 3600)))
+        self._conn = connect(database_url)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS work_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    queue TEXT NOT NULL,
+                    dedup_key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_token TEXT,
+                    visible_at REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    UNIQUE (queue, dedup_key)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_work_queue_visible ON work_queue (queue, status, visible_at)"
+            )
+
+    def put(self, items: Iterable[Tuple[str, Any]]) -> int:
+        """Queue ``(dedup_key, payload)`` pairs; returns how many were new."""
+
+        now = time.time()
+        rows = [(self.name, key, json.dumps(payload), now, now) for key, payload in items]
+        with self._lock, self._conn:
+            # Finished items only block re-queueing for the retention period.
+            self._conn.execute(
+                "DELETE FROM work_queue WHERE queue = ? AND status = 'done' AND updated_at < ?",
+                (self.name, now - self.retention),
+            )
+            self._conn.executemany(
+                "DELETE FROM work_queue WHERE queue = ? AND dedup_key = ? AND status = 'dead'",
+                [(self.name, key) for _, key, _, _, _ in rows],
+            )
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO work_queue (queue, dedup_key, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            return self._conn.total_changes - before
+
+    def lease(self, limit: int = 20, visibility_timeout: float = 300.0) -> List[Lease]:
+        """Take up to ``limit`` visible items for ``visibility_timeout`` seconds.
+
+        Pending items and items whose earlier lease expired are both
+        visible, unless that lease was their last attempt: those are parked
+        as dead, so an item that keeps killing its worker is not retried
+        forever. The select and update run in one write transaction, so two
+        processes never lease the same item.
+        """
+
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "UPDATE work_queue SET status = 'dead', lease_token = NULL, last_error = 'lease expired', "
+                "updated_at = ? WHERE queue = ? AND status = 'leased' AND visible_at <= ? AND attempts >= ?",
+                (now, self.name, now, self.max_attempts),
+            )
+            rows = self._conn.execute(
+                "SELECT id, payload, attempts FROM work_queue WHERE queue = ? "
+                "AND status IN ('pending', 'leased') AND visible_at <= ? ORDER BY id LIMIT ?",
+                (self.name, now, limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE work_queue SET status = 'leased', lease_token = ?, attempts = attempts + 1, "
+                "visible_at = ?, updated_at = ? WHERE id = ?",
+                [(token, now + visibility_timeout, now, row_id) for row_id, _, _ in rows],
+            )
+        return [Lease(row_id, token, json.loads(payload), attempts + 1) for row_id, payload, attempts in rows]
+
+    def ack(self, leases: Iterable[Lease]) -> int:
+        """Mark leased items done; returns how many leases were still current."""
+
+        now = time.time()
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "UPDATE work_queue SET status = 'done', lease_token = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_token = ? AND status = 'leased'",
+                [(now, lease.id, lease.token) for lease in leases],
+            )
+            return self._conn.total_changes - before
+
+    def fail(self, leases: Iterable[Lease], error: str) -> None:
+        """Release leased items for a retry after a backoff, or park them as dead."""
+
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                UPDATE work_queue SET
+                    status = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END,
+                    lease_token = NULL,
+                    visible_at = ? + MIN(300, 5 * (1 << attempts)),
+                    last_error = ?,
+                    updated_at = ?
+                WHERE id = ? AND lease_token = ? AND status = 'leased'
+                """,
+                [(self.max_attempts, now, error[:500], now, lease.id, lease.token) for lease in leases],
+            )
+
+    def counts(self) -> dict:
+        """Items per status, e.g. ``{"pending": 3, "leased": 1, "done": 40}``."""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM work_queue WHERE queue = ? GROUP BY status", (self.name,)
+            ).fetchall()
+        return dict(rows)
+
+    def outstanding(self) -> int:
+        """Items not finished yet: pending, or leased (possibly by a dead worker)."""
+
+        counts = self.counts()
+        return counts.get("pending", 0) + counts.get("leased", 0)
+
+    def close(self) -> None:
+        self._conn.close()
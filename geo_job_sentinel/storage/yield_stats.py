@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from .db import connect
+
+
+class YieldStore:
+    """Per-query yield history used to run unproductive queries less often.
+
+    Rows are keyed by ``(scope, key)``, e.g. ``("ats_shard", shard_id)``. A
+    query that found no new jobs on its last ``n`` runs is skipped for
+    ``2**n - 1`` runs in between (capped by YIELD_MAX_BACKOFF_EXP, default 3).
+
+    For the adaptive scheduler, rows also carry a polling interval, the
+    time the query is next due and a smoothed new-jobs-per-API-call rate
+    (``reschedule``), and the store counts metered API calls per UTC day
+    against the daily budget (``spend`` / ``spent_today``).
+    """
+
+    def __init__(self, database_url: str) -> None:
+        self.max_backoff_exp = int(os.getenv("YIELD_MAX_BACKOFF_EXP", "3"))
+        self._conn = connect(database_url)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scan_yield (
+                    scope TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    label TEXT,
+                    runs INTEGER NOT NULL DEFAULT 0,
+                    api_calls REAL NOT NULL DEFAULT 0,
+                    results INTEGER NOT NULL DEFAULT 0,
+                    new_jobs INTEGER NOT NULL DEFAULT 0,
+                    empty_streak INTEGER NOT NULL DEFAULT 0,
+                    skips_since_run INTEGER NOT NULL DEFAULT 0,
+                    last_run TEXT,
+                    interval_seconds REAL,
+                    next_due REAL NOT NULL DEFAULT 0,
+                    yield_rate REAL,
+                    PRIMARY KEY (scope, key)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS api_budget (day TEXT PRIMARY KEY, calls INTEGER NOT NULL DEFAULT 0)"
+            )
+
+    def is_due(self, scope: str, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT empty_streak, skips_since_run FROM scan_yield WHERE scope = ? AND key = ?",
+                (scope, key),
+            ).fetchone()
+        if row is None:
+            return True
+        empty_streak, skips_since_run = row
+        return skips_since_run >= 2 ** min(empty_streak, self.max_backoff_exp) - 1
+
+    def record_run(
+        self, scope: str, key: str, api_calls: float, results: int, new_jobs: int, label: str = ""
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO scan_yield (scope, key, label, runs, api_calls, results, new_jobs,
+                                        empty_streak, skips_since_run, last_run)
+                VALUES (?, ?, ?, 1, ?, ?, ?, ?, 0, ?)
+                ON CONFLICT (scope, key) DO UPDATE SET
+                    label = excluded.label,
+                    runs = runs + 1,
+                    api_calls = api_calls + excluded.api_calls,
+                    results = results + excluded.results,
+                    new_jobs = new_jobs + excluded.new_jobs,
+                    empty_streak = CASE WHEN excluded.new_jobs > 0 THEN 0 ELSE empty_streak + 1 END,
+                    skips_since_run = 0,
+                    last_run = excluded.last_run
+                """,
+                (
+                    scope,
+                    key,
+                    label,
+                    api_calls,
+                    results,
+                    new_jobs,
+                    0 if new_jobs > 0 else 1,
+                    datetime.utcnow().isoformat(),
+                ),
+            )
+
+    def record_skip(self, scope: str, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE scan_yield SET skips_since_run = skips_since_run + 1 WHERE scope = ? AND key = ?",
+                (scope, key),
+            )
+
+    def next_due(self, scope: str, key: str) -> float:
+        """Epoch seconds when the query is next due; 0 if it never ran."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT next_due FROM scan_yield WHERE scope = ? AND key = ?", (scope, key)
+            ).fetchone()
+        return row[0] if row else 0.0
+
+    def yield_rate(self, scope: str, key: str) -> Optional[float]:
+        """Smoothed new jobs per API call; None before the first metered run."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT yield_rate FROM scan_yield WHERE scope = ? AND key = ?", (scope, key)
+            ).fetchone()
+        return row[0] if row else None
+
+    def calls_per_run(self, scope: str, key: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT api_calls, runs FROM scan_yield WHERE scope = ? AND key = ?", (scope, key)
+            ).fetchone()
+        if not row or not row[1]:
+            return None
+        return row[0] / row[1]
+
+    def reschedule(
+        self,
+        scope: str,
+        key: str,
+        api_calls: int,
+        new_jobs: int,
+        initial: float,
+        shortest: float,
+        longest: float,
+        smoothing: float = 0.3,
+    ) -> float:
+        """Set the next due time after a run (recorded with ``record_run``).
+
+        The interval (``initial`` for the first run) halves after a run with
+        new jobs and doubles after an empty one, within ``shortest`` and
+        ``longest`` seconds. Returns the new interval.
+        """
+
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT interval_seconds, yield_rate FROM scan_yield WHERE scope = ? AND key = ?",
+                (scope, key),
+            ).fetchone()
+            interval, rate = row if row else (None, None)
+            interval = interval or initial
+            interval = interval / 2 if new_jobs > 0 else interval * 2
+            interval = min(max(interval, shortest), longest)
+            if api_calls:
+                sample = new_jobs / api_calls
+                rate = sample if rate is None else (1 - smoothing) * rate + smoothing * sample
+            self._conn.execute(
+                "UPDATE scan_yield SET interval_seconds = ?, next_due = ?, yield_rate = ? "
+                "WHERE scope = ? AND key = ?",
+                (interval, now + interval, rate, scope, key),
+            )
+        return interval
+
+    def spend(self, calls: int) -> None:
+        """Count ``calls`` metered API calls against today's (UTC) budget."""
+
+        if calls <= 0:
+            return
+        day = datetime.utcnow().date().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO api_budget (day, calls) VALUES (?, ?) "
+                "ON CONFLICT (day) DO UPDATE SET calls = calls + excluded.calls",
+                (day, calls),
+            )
+
+    def spent_today(self) -> int:
+        day = datetime.utcnow().date().isoformat()
+        with self._lock:
+            row = self._conn.execute("SELECT calls FROM api_budget WHERE day = ?", (day,)).fetchone()
+        return row[0] if row else 0
+
+    def close(self) -> None:
+        self._conn.close()
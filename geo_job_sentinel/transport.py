@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .metrics import metrics
+
+
+logger = logging.getLogger("geo_job_sentinel.transport")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session shared by every HTTP client.
+
+    Connections are kept alive and reused across calls and threads; pool size
+    per host is HTTP_POOL_SIZE (default 20).
+    """
+
+    global _session
+    with _session_lock:
+        if _session is None:
+            pool_size = int(os.getenv("HTTP_POOL_SIZE", "20"))
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def retry_after_seconds(resp: requests.Response) -> Optional[float]:
+    """Seconds the server asked us to wait, from standard or provider headers."""
+
+    headers = resp.headers
+    value = headers.get("Retry-After")
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+
+    # Discord: relative seconds; Twitter: absolute epoch seconds.
+    if headers.get("X-RateLimit-Reset-After"):
+        try:
+            return max(float(headers["X-RateLimit-Reset-After"]), 0.0)
+        except ValueError:
+            pass
+    if headers.get("x-rate-limit-reset"):
+        try:
+            return max(float(headers["x-rate-limit-reset"]) - time.time(), 0.0)
+        except ValueError:
+            pass
+
+    return None
+
+
+def _backoff(attempt: int) -> float:
+    # Exponential backoff with full jitter.
+    base = float(os.getenv("HTTP_BACKOFF_BASE_SECONDS", "0.5"))
+    cap = float(os.getenv("HTTP_BACKOFF_MAX_SECONDS", "30"))
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def request(method: str, url: str, max_retries: Optional[int] = None, **kwargs) -> requests.Response:
+    """Send a request through the shared session, retrying 429/5xx and network errors.
+
+    A server-supplied wait (Retry-After and friends) takes precedence over
+    the jittered backoff. If that wait exceeds HTTP_MAX_RETRY_WAIT_SECONDS
+    (default 60) the response is returned as-is instead of sleeping. After
+    the last retry the final response is returned for the caller to handle.
+    Retries and server-requested waits are counted in ``metrics`` per host.
+    """
+
+    if max_retries is None:
+        max_retries = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    max_wait = float(os.getenv("HTTP_MAX_RETRY_WAIT_SECONDS", "60"))
+    session = get_session()
+    host = urlsplit(url).hostname or ""
+
+    attempt = 0
+    while True:
+        try:
+            resp = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            if attempt >= max_retries:
+                raise
+            delay = _backoff(attempt)
+            logger.warning("%s %s failed (%s); retrying in %.1fs", method, url, exc, delay)
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                return resp
+            server_wait = retry_after_seconds(resp)
+            if server_wait is not None and server_wait > max_wait:
+                return resp
+            delay = server_wait if server_wait is not None else _backoff(attempt)
+            logger.warning(
+                "%s %s returned %s; retrying in %.1fs", method, url, resp.status_code, delay
+            )
+            if server_wait is not None:
+                metrics.inc("rate_limit_wait_seconds_total", delay, limiter=host)
+
+        metrics.inc("http_retries_total", host=host)
+        time.sleep(delay)
+        attempt += 1
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
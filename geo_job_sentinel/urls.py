@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+TRACKING_PARAMS = {
+    "gclid",
+    "fbclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "referrer",
+    "src",
+    "trk",
+    "gh_src",
+    "lever-source",
+    "lever-origin",
+    "lever-via",
+}
+
+
+def normalize_url(url: str) -> str:
+    """Reduce a posting URL to a stable key for cross-run deduplication.
+
+    Lower-cases scheme/host, drops ``www.``, fragments, tracking parameters
+    and trailing slashes, and sorts the remaining query parameters.
+    """
+
+    url = (url or "").strip()
+    if not url:
+        return ""
+
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/")
+
+    return urlunsplit(((parts.scheme or "https").lower(), host, path, urlencode(query), ""))
+
+
+def _root_domain(host: str) -> str:
+    return ".".join(host.split(".")[-2:])
+
+
+def _greenhouse(host: str, path: str, query: str) -> Optional[str]:
+    # boards./jobs./job-boards.greenhouse.io/<board>/jobs/<id>, or the embed form
+    # boards.greenhouse.io/embed/job_app?for=<board>&token=<id>
+    match = re.match(r"^/([^/]+)/jobs/(\d+)", path)
+    if match:
+        return f"https://boards.greenhouse.io/{match.group(1).lower()}/jobs/{match.group(2)}"
+    params = parse_qs(query)
+    if path.startswith("/embed/job_app") and params.get("for") and params.get("token"):
+        return f"https://boards.greenhouse.io/{params['for'][0].lower()}/jobs/{params['token'][0]}"
+    return None
+
+
+def _lever(host: str, path: str, query: str) -> Optional[str]:
+    # jobs.lever.co/<company>/<uuid>[/apply]
+    match = re.match(r"^/([^/]+)/([0-9a-f-]{36})", path, re.IGNORECASE)
+    if match:
+        return f"https://jobs.lever.co/{match.group(1).lower()}/{match.group(2).lower()}"
+    return None
+
+
+def _workable(host: str, path: str, query: str) -> Optional[str]:
+    # apply.workable.com/<company>/j/<shortcode>[/apply]
+    match = re.match(r"^/([^/]+)/j/([0-9A-Za-z]+)", path)
+    if match:
+        return f"https://apply.workable.com/{match.group(1).lower()}/j/{match.group(2).upper()}"
+    return None
+
+
+def _smartrecruiters(host: str, path: str, query: str) -> Optional[str]:
+    # jobs.smartrecruiters.com/<Company>/<numeric id>-<title slug>
+    match = re.match(r"^/([^/]+)/(\d+)", path)
+    if match:
+        return f"https://jobs.smartrecruiters.com/{match.group(1).lower()}/{match.group(2)}"
+    return None
+
+
+def _workday(host: str, path: str, query: str) -> Optional[str]:
+    # <tenant>.wd5.myworkdayjobs.com/[en-US/]<site>/job/<location>/<title>_<req id>[/apply]
+    path = re.sub(r"^/[a-z]{2}-[A-Z]{2}(?=/)", "", path)
+    path = re.sub(r"/apply(/.*)?$", "", path)
+    return f"https://{host}{path}"
+
+
+# Canonicalization rules keyed by the root domain of an ATS host. A rule only
+# applies to hosts whose root matches a domain from config/ats_domains.json.
+ATS_URL_RULES: Dict[str, Callable[[str, str, str], Optional[str]]] = {
+    "greenhouse.io": _greenhouse,
+    "lever.co": _lever,
+    "workable.com": _workable,
+    "smartrecruiters.com": _smartrecruiters,
+    "myworkdayjobs.com": _workday,
+}
+
+
+def ats_posting_url(url: str, ats_domains: Optional[Iterable[str]] = None) -> Optional[str]:
+    """Canonical URL of the ATS posting ``url`` points to, or None if it is not one.
+
+    ``ats_domains`` is interpreted as in ``canonical_url``.
+    """
+
+    normalized = normalize_url(url)
+    if not normalized:
+        return None
+
+    parts = urlsplit(normalized)
+    host = parts.hostname or ""
+    root = _root_domain(host)
+    rule = ATS_URL_RULES.get(root)
+    if rule is None:
+        return None
+    if ats_domains is not None and root not in {_root_domain(d.strip().lower()) for d in ats_domains}:
+        return None
+
+    return rule(host, parts.path, parts.query)
+
+
+def canonical_url(url: str, ats_domains: Optional[Iterable[str]] = None) -> str:
+    """Normalize ``url`` and collapse ATS-specific variants of the same posting.
+
+    ``ats_domains`` restricts ATS rules to the configured domains (matched on
+    their root domain, so ``boards.greenhouse.io`` also covers
+    ``jobs.greenhouse.io``). ``None`` enables every rule.
+    """
+
+    return ats_posting_url(url, ats_domains) or normalize_url(url)
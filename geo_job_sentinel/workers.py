@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .config_loader import ScanProfile, load_config, scan_profiles
+from .discord_integration.delivery import DeliveryQueue
+from .enrichment import PageEnricher, enrichment_enabled
+from .metrics import metrics
+from .models import JobPosting
+from .search.pipeline import stream_profile_batches
+from .storage.job_index import JobIndex
+from .storage.page_cache import PageCache
+from .storage.seen_jobs import SeenJobStore, job_key
+from .storage.work_queue import Lease, WorkQueue
+
+
+logger = logging.getLogger("geo_job_sentinel.workers")
+
+JOBS_QUEUE = "jobs"
+
+
+def work_queue_enabled() -> bool:
+    """SCAN_QUEUE=1 makes scans produce into the work queue instead of delivering."""
+
+    return os.getenv("SCAN_QUEUE", "0") not in ("0", "false", "no", "")
+
+
+def produce(
+    profiles: Iterable[ScanProfile], stats: dict, only: Optional[Iterable[str]] = None
+) -> Dict[str, List[JobPosting]]:
+    """Producer role: scan ``profiles`` and queue every job not reported yet.
+
+    Each job is queued once, keyed by its canonical URL, with the names of
+    the profiles it belongs to. Jobs already in the seen-jobs store are
+    dropped (so ``stats`` counts only jobs not reported before), but
+    recording them there, enrichment, indexing and delivery are left to
+    ``consume``. Returns the queued jobs per profile, for the run summary.
+    ``only`` is passed on to ``stream_profile_batches``.
+    """
+
+    profiles = list(profiles)
+    cfg = load_config()
+    queue = WorkQueue(cfg.database_url, JOBS_QUEUE)
+    found: Dict[str, List[JobPosting]] = {profile.name: [] for profile in profiles}
+    queued = 0
+    batches = stream_profile_batches(profiles, stats, finish=False, only=only, mark_seen=False)
+    try:
+        for targets, batch in batches:
+            names = [profile.name for profile in targets]
+            with metrics.timer("work_queue_put"):
+                queued += queue.put((job_key(job), {"profiles": names, "job": job.to_dict()}) for job in batch)
+            for name in names:
+                found[name].extend(batch)
+    finally:
+        queue.close()
+
+    stats["queued"] = queued
+    return found
+
+
+class _Consumer:
+    """State one consumer process keeps across leased batches."""
+
+    def __init__(self) -> None:
+        cfg = load_config()
+        self.queue = WorkQueue(cfg.database_url, JOBS_QUEUE)
+        self.seen = SeenJobStore(cfg.database_url)
+        self.index = JobIndex(cfg.database_url)
+        self.enricher = PageEnricher(PageCache(cfg.database_url)) if enrichment_enabled() else None
+        self.profiles = {profile.name: profile for profile in scan_profiles(cfg)}
+        self.deliveries: Dict[str, DeliveryQueue] = {}
+        self.processed = 0
+
+    def _delivery(self, channel: str, webhook_url: Optional[str]) -> DeliveryQueue:
+        queue = self.deliveries.get(channel)
+        if queue is None:
+            queue = DeliveryQueue.from_config(webhook_url, channel).start()
+            self.deliveries[channel] = queue
+        return queue
+
+    def handle(self, leases: List[Lease]) -> None:
+        jobs = [JobPosting.from_dict(lease.payload["job"]) for lease in leases]
+        # Jobs marked seen were fully handed to the outbox by an earlier
+        # attempt (the mark comes last), so a retried lease skips them.
+        fresh = self.seen.filter_new(jobs)
+        if self.enricher is not None and fresh:
+            with metrics.timer("enrich"):
+                self.enricher.enrich(fresh)
+        with metrics.timer("job_index"):
+            self.index.add(jobs)
+
+        fresh_keys = {job_key(job) for job in fresh}
+        routed: Dict[str, List[JobPosting]] = {}
+        webhooks: Dict[str, Optional[str]] = {}
+        for lease, job in zip(leases, jobs):
+            if job_key(job) not in fresh_keys:
+                continue
+            # A job shared by profiles on one channel is posted there once.
+            channels = {}
+            for name in lease.payload["profiles"]:
+                profile = self.profiles.get(name)
+                channels[profile.channel if profile else ""] = profile.webhook_url if profile else None
+            for channel, webhook_url in channels.items():
+                routed.setdefault(channel, []).append(job)
+                webhooks.setdefault(channel, webhook_url)
+        for channel, batch in routed.items():
+            self._delivery(channel, webhooks[channel]).submit(batch)
+
+        self.seen.mark_seen(fresh)
+
+    def close(self) -> None:
+        for delivery in self.deliveries.values():
+            delivery.flush()
+            delivery.stop()
+            delivery.outbox.close()
+        if self.enricher is not None:
+            self.enricher.close()
+            self.enricher.cache.close()
+        self.queue.close()
+        self.seen.close()
+        self.index.close()
+
+
+def consume(drain: bool = False, stop: Optional[threading.Event] = None) -> int:
+    """Consumer role: lease queued jobs, then enrich, index and deliver them.
+
+    Leases WORKER_BATCH_SIZE items (default 20) at a time for
+    WORK_QUEUE_VISIBILITY_SECONDS (default 300); a worker that dies
+    mid-batch leaves them to be leased again. Cards are handed to the
+    Discord outbox and then recorded in the seen-jobs store before the
+    lease is acked, so a retried batch skips jobs it already handed over.
+    With ``drain`` the worker returns once nothing is pending; otherwise it
+    polls every WORKER_POLL_SECONDS (default 2) until ``stop`` is set.
+    Returns the number of items acked.
+    """
+
+    batch_size = int(os.getenv("WORKER_BATCH_SIZE", "20"))
+    visibility = float(os.getenv("WORK_QUEUE_VISIBILITY_SECONDS", "300"))
+    poll = float(os.getenv("WORKER_POLL_SECONDS", "2"))
+
+    consumer = _Consumer()
+    try:
+        while stop is None or not stop.is_set():
+            leases = consumer.queue.lease(batch_size, visibility)
+            if not leases:
+                if drain and consumer.queue.outstanding() == 0:
+                    break
+                time.sleep(poll)
+                continue
+            try:
+                consumer.handle(leases)
+            except Exception as exc:
+                logger.exception("Work batch of %d items failed", len(leases))
+                consumer.queue.fail(leases, str(exc))
+                continue
+            consumer.processed += consumer.queue.ack(leases)
+    finally:
+        consumer.close()
+    return consumer.processed
+
+
+def _worker_main(drain: bool) -> None:
+    logging.basicConfig(level=logging.INFO)
+    processed = consume(drain=drain)
+    logger.info("Worker %s finished after %d items", os.getpid(), processed)
+
+
+def run_workers(processes: Optional[int] = None, drain: bool = False) -> None:
+    """Run ``processes`` consumers (WORKER_PROCESSES, default 2) until they exit."""
+
+    processes = processes or int(os.getenv("WORKER_PROCESSES", "2"))
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_worker_main, args=(drain,), name=f"geojob-worker-{i}")
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+        raise
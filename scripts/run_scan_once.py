@@ -1,18 +1,44 @@
 from __future__ import annotations
 
-from geo_job_sentinel.search.pipeline import run_full_scan
-from geo_job_sentinel.discord_integration.webhook import send_job_card, send_summary
+from dataclasses import replace
+from typing import Iterator, List
+
+from geo_job_sentinel.config_loader import DEFAULT_PROFILE, SCAN_SOURCES, scan_profiles
+from geo_job_sentinel.metrics import metrics
+from geo_job_sentinel.models import JobPosting
+from geo_job_sentinel.search.pipeline import stream_full_scan
+from geo_job_sentinel.discord_integration.delivery import deliver_batches
+from geo_job_sentinel.discord_integration.webhook import send_summary
+from geo_job_sentinel.workers import produce, run_workers, work_queue_enabled
 
 
 def main() -> None:
-    jobs, stats = run_full_scan()
+    stats: dict = {}
+    jobs: List[JobPosting] = []
+
+    if work_queue_enabled():
+        # Queue the jobs, then let worker processes enrich and deliver them,
+        # along with anything an interrupted earlier run left in the queue.
+        profile = next(p for p in scan_profiles() if p.name == DEFAULT_PROFILE)
+        jobs = produce([replace(profile, sources=SCAN_SOURCES)], stats)[DEFAULT_PROFILE]
+        run_workers(drain=True)
+        stats["metrics"] = metrics.snapshot()
+        metrics.write_json()
+        send_summary(jobs, stats)
+        return
+
+    def scanned() -> Iterator[List[JobPosting]]:
+        for batch in stream_full_scan(stats):
+            jobs.extend(batch)
+            yield batch
 
-    # Limit number of individual job cards per run to avoid hitting
-    # Discord webhook rate limits.
-    max_cards = 15
-    for job in jobs[:max_cards]:
-        send_job_card(job)
+    # Cards go out while slower sources are still scanning. They are batched
+    # up to 10 per message and paced by Discord's rate-limit headers;
+    # anything that still fails stays in the outbox for the next run.
+    deliver_batches(scanned())
 
+    stats["metrics"] = metrics.snapshot()
+    metrics.write_json()
     send_summary(jobs, stats)
 
 
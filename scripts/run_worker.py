@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import argparse
+
+from geo_job_sentinel.workers import run_workers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Enrich, index and deliver jobs queued by SCAN_QUEUE scans.")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default WORKER_PROCESSES, 2)")
+    parser.add_argument("--drain", action="store_true", help="exit once the queue is empty")
+    args = parser.parse_args()
+    run_workers(args.processes, drain=args.drain)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Conditional polling of ATS board feeds against the recorded fixtures.
+
+Serves ``benchmarks/fixtures/ats_boards/greenhouse.io/examplegeo.json``
+(copied, so tests can edit it) through ``FakeProviderServer``.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fake_providers import FakeProviderServer
+from geo_job_sentinel.search import ats_boards
+from geo_job_sentinel.search.ats_boards import AtsBoardClient, Board
+from geo_job_sentinel.storage.feed_state import FeedStateStore
+
+
+FIXTURES = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "ats_boards"
+BOARD = Board("greenhouse.io", "examplegeo")
+
+
+@pytest.fixture
+def feed(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    shutil.copytree(FIXTURES, fixtures)
+    return fixtures / "greenhouse.io" / "examplegeo.json"
+
+
+@pytest.fixture
+def server(feed, monkeypatch):
+    server = FakeProviderServer(fixtures_dir=feed.parent.parent).start()
+    for root, (_, parser) in list(ats_boards.BOARD_FEEDS.items()):
+        monkeypatch.setitem(ats_boards.BOARD_FEEDS, root, (f"{server.url}/boards/{root}/{{token}}", parser))
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(tmp_path, server):
+    state = FeedStateStore(f"sqlite:///{tmp_path}/feeds.sqlite3")
+    yield AtsBoardClient(state)
+    state.close()
+
+
+def _titles(items):
+    return [item["title"] for item in items]
+
+
+def _edit(feed: Path, edit) -> None:
+    data = json.loads(feed.read_text(encoding="utf-8"))
+    edit(data["jobs"])
+    feed.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_first_fetch_parses_postings(client, server):
+    items, changed = client.fetch(BOARD)
+
+    assert changed
+    assert _titles(items) == ["GIS Analyst", "Senior GIS Developer", "Staff Accountant"]
+    assert items[0]["link"] == "https://boards.greenhouse.io/examplegeo/jobs/4012345"
+    assert items[0]["location"] == "Denver, CO"
+    assert server.not_modified == 0
+
+
+def test_unchanged_feed_is_a_304_returning_stored_postings(client, server):
+    first, _ = client.fetch(BOARD)
+
+    items, changed = client.fetch(BOARD)
+
+    assert not changed
+    assert items == first
+    assert server.not_modified == 1
+
+
+def test_changed_body_is_parsed_again(client, server, feed):
+    client.fetch(BOARD)
+    _edit(feed, lambda jobs: jobs[0].update(title="Lead GIS Analyst"))
+
+    items, changed = client.fetch(BOARD)
+
+    assert changed
+    assert _titles(items) == ["Lead GIS Analyst", "Senior GIS Developer", "Staff Accountant"]
+    assert server.not_modified == 0
+    assert client.fetch(BOARD) == (items, False)
+
+
+def test_removed_posting_is_dropped(client, server, feed):
+    client.fetch(BOARD)
+    _edit(feed, lambda jobs: jobs.pop(1))
+
+    items, changed = client.fetch(BOARD)
+
+    assert changed
+    assert _titles(items) == ["GIS Analyst", "Staff Accountant"]
+    assert client.fetch(BOARD) == (items, False)